@@ -7,24 +7,578 @@ of Terraform dependency graphs with support for multiple output formats.
 """
 
 import argparse
+import functools
+import gzip
+import hashlib
+import io
 import json
+import logging
+import mmap
+import multiprocessing
 import os
+import pickle
+import re
 import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
-import tempfile
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 try:
     import hcl2
-    import networkx as nx
     import graphviz
-    from flask import Flask, render_template_string, request, jsonify, send_from_directory
+    from flask import Flask, Response, request, jsonify
     from jinja2 import Template
 except ImportError as e:
     print(f"Error: Missing required dependency - {e}")
     print("Please install dependencies with: pip install -r requirements.txt")
     sys.exit(1)
 
+# Optional: C-accelerated JSON serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: faster content hashing for the parse cache
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Optional: multi-threaded production WSGI server
+try:
+    from waitress import serve as wsgi_serve
+except ImportError:
+    wsgi_serve = None
+
+# Optional: linear-time regex engine for the reference scanner
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+
+# Node styling by Terraform resource type
+_COLOR_MAP = {
+    # AWS Resources
+    'aws_vpc': '#FF6B6B',
+    'aws_subnet': '#4ECDC4',
+    'aws_internet_gateway': '#45B7D1',
+    'aws_nat_gateway': '#96CEB4',
+    'aws_route_table': '#FFEAA7',
+    'aws_security_group': '#DDA0DD',
+    'aws_instance': '#98D8C8',
+    'aws_lb': '#F7DC6F',
+    'aws_rds_cluster': '#BB8FCE',
+    'aws_iam_role': '#85C1E9',
+    'aws_s3_bucket': '#F8C471',
+    'aws_lambda_function': '#82E0AA',
+    'aws_eks_cluster': '#F1948A',
+    'aws_autoscaling_group': '#85C1E9',
+    'aws_cloudwatch_log_group': '#F7DC6F',
+
+    # Azure Resources
+    'azurerm_virtual_network': '#FF6B6B',
+    'azurerm_subnet': '#4ECDC4',
+    'azurerm_network_interface': '#45B7D1',
+    'azurerm_virtual_machine': '#96CEB4',
+    'azurerm_app_service_plan': '#FFEAA7',
+    'azurerm_app_service': '#DDA0DD',
+    'azurerm_storage_account': '#98D8C8',
+    'azurerm_sql_database': '#F7DC6F',
+    'azurerm_kubernetes_cluster': '#BB8FCE',
+
+    # Google Cloud Resources
+    'google_compute_network': '#FF6B6B',
+    'google_compute_subnetwork': '#4ECDC4',
+    'google_compute_instance': '#96CEB4',
+    'google_storage_bucket': '#F8C471',
+    'google_container_cluster': '#BB8FCE',
+}
+_DEFAULT_COLOR = '#CCCCCC'
+
+_SHAPE_MAP = {
+    # Network resources
+    'aws_vpc': 'box',
+    'aws_subnet': 'box',
+    'aws_internet_gateway': 'diamond',
+    'aws_nat_gateway': 'diamond',
+    'aws_route_table': 'box',
+    'aws_security_group': 'ellipse',
+
+    # Compute resources
+    'aws_instance': 'box',
+    'aws_lb': 'diamond',
+    'aws_autoscaling_group': 'box',
+    'aws_lambda_function': 'ellipse',
+    'aws_eks_cluster': 'box',
+
+    # Storage and database
+    'aws_s3_bucket': 'cylinder',
+    'aws_rds_cluster': 'cylinder',
+}
+_DEFAULT_SHAPE = 'box'
+
+# Checked in order; the first matching prefix wins
+_GROUP_PREFIXES = (
+    (('aws_vpc', 'aws_subnet'), 'networking'),
+    (('aws_instance', 'aws_lb'), 'compute'),
+    (('aws_s3', 'aws_rds'), 'storage'),
+    (('aws_iam',), 'security'),
+    (('aws_lambda',), 'serverless'),
+    (('aws_eks',), 'kubernetes'),
+)
+_DEFAULT_GROUP = 'other'
+
+
+@functools.lru_cache(maxsize=4096)
+def _node_style(resource_type: str) -> Tuple[str, str, str]:
+    """(color, shape, group) for a resource type, resolved once per type."""
+    group = _DEFAULT_GROUP
+    for prefixes, candidate in _GROUP_PREFIXES:
+        if resource_type.startswith(prefixes):
+            group = candidate
+            break
+    return (_COLOR_MAP.get(resource_type, _DEFAULT_COLOR),
+            _SHAPE_MAP.get(resource_type, _DEFAULT_SHAPE),
+            group)
+
+
+def _json_bytes(data, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None, sort_keys=sort_keys).encode('utf-8')
+
+
+def _dot_quote(value: str) -> str:
+    """Quote a string as a DOT double-quoted ID.
+
+    Backslashes are left alone, as the graphviz package does: the DOT lexer
+    only unescapes \\", and labels rely on the remaining escape sequences.
+    """
+    return '"' + value.replace('"', '\\"') + '"'
+
+
+# Node types _extract_dependencies descends into
+_CONTAINER_TYPES = frozenset((dict, list))
+
+
+# Dotted traversals such as aws_vpc.main.id, var.region or
+# data.aws_ami.ubuntu.id inside "${...}" expressions. python-hcl2 hands
+# expressions back as strings, so references are recovered by scanning them.
+# No nested quantifiers, so matching stays linear on long attribute values;
+# with re2 installed that is guaranteed by the engine. RE2 has no lookbehind,
+# so there the boundary character before a traversal is consumed instead.
+# Both patterns are also valid re syntax and must find the same groups.
+_REFERENCE_PATTERN = (
+    r'(?<![\w.-])([A-Za-z_][\w-]*)\.([A-Za-z_][\w-]*)(?:\.([A-Za-z_][\w-]*))?'
+)
+_REFERENCE_PATTERN_RE2 = (
+    r'(?:^|[^\w.-])([A-Za-z_][\w-]*)\.([A-Za-z_][\w-]*)(?:\.([A-Za-z_][\w-]*))?'
+)
+if re2 is not None:
+    _REFERENCE_RE = re2.compile(_REFERENCE_PATTERN_RE2)
+else:
+    _REFERENCE_RE = re.compile(_REFERENCE_PATTERN)
+
+
+@functools.lru_cache(maxsize=65536)
+def _scan_references(expression: str) -> Tuple[str, ...]:
+    """Candidate node ids referenced by an HCL expression string.
+
+    Returns 'type.name' for every traversal, plus 'data.type.name' for data
+    source references; callers drop candidates that are not graph nodes
+    (local.*, each.*, count.*, ...). Candidates are interned like node ids,
+    so matching one against a node is an identity check.
+    """
+    refs = []
+    for first, second, third in _REFERENCE_RE.findall(expression):
+        refs.append(sys.intern(f"{first}.{second}"))
+        if first == 'data' and third:
+            refs.append(sys.intern(f"data.{second}.{third}"))
+    return tuple(refs)
+
+
+# Directories that never hold configuration of their own, besides hidden
+# ones (.terraform, .terragrunt-cache, .git, ...), which are always skipped
+_SKIP_DIRS = frozenset(('node_modules',))
+
+
+def _iter_tf_files(root: str) -> Iterator[str]:
+    """Yield the paths of all .tf files under root, skipping hidden dirs and _SKIP_DIRS."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    name = entry.name
+                    if not name.startswith('.') and name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith('.tf'):
+                    yield entry.path
+
+
+def _read_text(path: str) -> str:
+    """Decode a UTF-8 file straight from a memory map, translating newlines like text mode."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, 'utf-8')
+
+    # hcl2's grammar only accepts \n line endings
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _parse_one(path: str) -> Tuple[str, List[Dict], Optional[str]]:
+    """Parse a single .tf file into a list of single-key HCL blocks.
+
+    Runs inside a worker process, so parse errors are returned rather than raised.
+    """
+    try:
+        parsed = hcl2.loads(_read_text(path))
+    except Exception as e:
+        return path, [], str(e)
+
+    # python-hcl2 groups blocks by kind ({'resource': [...], ...}); flatten
+    # them into one {kind: body} dict per block
+    blocks = []
+    for kind, bodies in parsed.items():
+        if isinstance(bodies, list):
+            blocks.extend({kind: body} for body in bodies)
+    return path, blocks, None
+
+
+# Content types for the web server's /export/<format> downloads
+_EXPORT_MIMETYPES = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+    'json': 'application/json',
+}
+
+# On-disk cache of parsed blocks, keyed by a fingerprint of the file contents
+CACHE_DIR = Path(os.environ.get('BLAST_RADIUS_CACHE_DIR',
+                                Path.home() / '.cache' / 'blast_radius'))
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Bump whenever _parse_one changes what it returns. Together with the hcl2
+# version it is part of every cache key, so entries written by an older
+# parser are never served (the reference scanner relies on hcl2's exact
+# "${...}" output)
+CACHE_FORMAT_VERSION = 1
+_CACHE_KEY_PREFIX = f"{CACHE_FORMAT_VERSION}:{getattr(hcl2, '__version__', '')}:".encode('utf-8')
+
+# Temporary files older than this were left behind by a crashed writer
+CACHE_STALE_TMP_SECONDS = 3600
+
+# Larger files are skipped with a warning; HCL parsing degrades badly on them
+MAX_FILE_BYTES = 10 * 1024 * 1024
+
+# From this many nodes on, the page layout is computed with sfdp; dot's
+# layered layout does not scale to graphs that large
+SFDP_MIN_NODES = 500
+
+# Below this many files to parse, parse_terraform stays in-process; each
+# spawned worker re-imports this module and hcl2 before it parses anything
+MIN_PARALLEL_FILES = 32
+
+# In-process layer in front of the disk cache, keyed by the same fingerprint
+_blocks_memo: Dict[str, List[Dict]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _fingerprint(path: str, mtime_ns: int, size: int) -> str:
+    """Hash a file's bytes together with the parser and cache format versions.
+
+    Memoized on (path, mtime_ns, size) so unchanged files are not re-read.
+    """
+    digest = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    digest.update(_CACHE_KEY_PREFIX)
+    if size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            digest.update(mm)
+    return digest.hexdigest()
+
+
+def _load_cached_blocks(key: str) -> Optional[List[Dict]]:
+    """Return cached parsed blocks for a fingerprint, or None on a miss."""
+    if key in _blocks_memo:
+        return _blocks_memo[key]
+
+    cache_file = CACHE_DIR / f"{key}.pkl"
+    try:
+        with open(cache_file, 'rb') as f:
+            blocks = pickle.load(f)
+        os.utime(cache_file)  # mtime doubles as the LRU clock for eviction
+    except Exception:
+        return None
+
+    _blocks_memo[key] = blocks
+    return blocks
+
+
+def _store_cached_blocks(key: str, blocks: List[Dict]) -> None:
+    """Write parsed blocks to the cache atomically; cache failures are not fatal."""
+    _blocks_memo[key] = blocks
+
+    cache_file = CACHE_DIR / f"{key}.pkl"
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(blocks, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+
+
+def _evict_cache() -> None:
+    """Drop least recently used cache entries once the cache exceeds CACHE_MAX_BYTES.
+
+    Temporary files older than CACHE_STALE_TMP_SECONDS are removed as well.
+    """
+    entries = []
+    stale_before = time.time_ns() - CACHE_STALE_TMP_SECONDS * 1_000_000_000
+    try:
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.endswith('.pkl'):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+            elif entry.name.endswith('.tmp') and entry.stat().st_mtime_ns < stale_before:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+
+
+# Without Graphviz, graphs up to this size get a server-side force layout;
+# the all-pairs repulsion is O(n^2) per iteration, so numba's compiled
+# kernel is allowed larger graphs
+FORCE_LAYOUT_MAX_NODES = 1000
+FORCE_LAYOUT_MAX_NODES_NUMBA = 2000
+
+# Longest side, in pixels, of a PNG drawn with Pillow; larger layouts are scaled down
+PNG_MAX_SIDE = 8000
+
+
+@functools.lru_cache(maxsize=None)
+def _layout_backend():
+    """Return (numpy, repulse, max_nodes) for _force_layout, or None without numpy.
+
+    numpy, and numba when it is installed, are imported on first use rather
+    than at module import: spawned parse workers re-import this module, and
+    the fallback layout only runs when Graphviz is missing.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+
+    try:
+        from numba import njit, prange
+    except ImportError:
+        def repulse(x, y, fx, fy, strength):
+            """Write the all-pairs repulsive force on every node into fx/fy."""
+            dx = x[:, None] - x[None, :]
+            dy = y[:, None] - y[None, :]
+            inv = strength / (dx * dx + dy * dy + 1e-4)
+            np.sum(dx * inv, axis=1, out=fx)
+            np.sum(dy * inv, axis=1, out=fy)
+
+        return np, repulse, FORCE_LAYOUT_MAX_NODES
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def repulse(x, y, fx, fy, strength):
+        """Write the all-pairs repulsive force on every node into fx/fy."""
+        n = x.shape[0]
+        for i in prange(n):
+            ax = 0.0
+            ay = 0.0
+            for j in range(n):
+                dx = x[i] - x[j]
+                dy = y[i] - y[j]
+                inv = strength / (dx * dx + dy * dy + 1e-4)
+                ax += dx * inv
+                ay += dy * inv
+            fx[i] = ax
+            fy[i] = ay
+
+    return np, repulse, FORCE_LAYOUT_MAX_NODES_NUMBA
+
+
+def _force_layout(n: int, src, dst, max_iterations: int = 300, k: float = 100.0,
+                  omega: float = 1.5, tol: float = 0.5, gravity: float = 1.0):
+    """Fruchterman-Reingold layout of n nodes with edges src[i] -> dst[i].
+
+    k is the ideal edge length, and gravity pulls every node towards the
+    centroid so disconnected components stay close. Each step is over-relaxed
+    by omega (SOR), and omega shrinks back towards 1 whenever the residual
+    (the largest distance any node moved) grows instead of falling. Iteration
+    stops once the residual drops below tol. Returns (x, y) float64 arrays;
+    the starting positions are seeded so the same graph always gets the same
+    layout.
+    """
+    np, repulse, _ = _layout_backend()
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0.0, k * np.sqrt(n), n)
+    y = rng.uniform(0.0, k * np.sqrt(n), n)
+    fx = np.empty(n)
+    fy = np.empty(n)
+    temperature = k * np.sqrt(n) / 10.0
+    previous = np.inf
+
+    for _ in range(max_iterations):
+        repulse(x, y, fx, fy, k * k)
+
+        # Springs pull linked nodes together
+        dx = x[src] - x[dst]
+        dy = y[src] - y[dst]
+        pull = np.hypot(dx, dy) / k
+        np.subtract.at(fx, src, dx * pull)
+        np.add.at(fx, dst, dx * pull)
+        np.subtract.at(fy, src, dy * pull)
+        np.add.at(fy, dst, dy * pull)
+
+        # Gravity keeps disconnected nodes from drifting off on their own
+        fx -= gravity * (x - x.mean())
+        fy -= gravity * (y - y.mean())
+
+        # Move each node along its net force, over-relaxed and capped by the temperature
+        length = np.hypot(fx, fy) + 1e-9
+        step = omega * np.minimum(length, temperature) / length
+        x += fx * step
+        y += fy * step
+
+        residual = float(np.max(length * step))
+        if residual < tol:
+            break
+        if residual > previous:
+            omega = max(1.0, omega * 0.9)
+        previous = residual
+        temperature *= 0.95
+
+    return x, y
+
+
+@dataclass
+class GraphStore:
+    """Dependency graph held as parallel per-node attribute lists.
+
+    Nodes are addressed by their position in ``node_ids``; edges are pairs of
+    node indices stored in the ``edges_src``/``edges_dst`` int arrays.
+    """
+
+    node_ids: List[str] = field(default_factory=list)
+    node_types: List[str] = field(default_factory=list)
+    node_resource_types: List[str] = field(default_factory=list)
+    node_names: List[str] = field(default_factory=list)
+    node_files: List[str] = field(default_factory=list)
+    node_colors: List[str] = field(default_factory=list)
+    node_shapes: List[str] = field(default_factory=list)
+    node_groups: List[str] = field(default_factory=list)
+    edges_src: array = field(default_factory=lambda: array('i'))
+    edges_dst: array = field(default_factory=lambda: array('i'))
+    id_to_idx: Dict[str, int] = field(default_factory=dict)
+
+    def add_node(self, node_id: str, node_type: str, name: str, file: str,
+                 color: str, shape: str, group: str, resource_type: str = '') -> int:
+        """Add a node, or replace the attributes of an existing one, and return its index."""
+        idx = self.id_to_idx.get(node_id)
+        if idx is None:
+            idx = self.id_to_idx[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+            self.node_types.append(node_type)
+            self.node_resource_types.append(resource_type)
+            self.node_names.append(name)
+            self.node_files.append(file)
+            self.node_colors.append(color)
+            self.node_shapes.append(shape)
+            self.node_groups.append(group)
+        else:
+            self.node_types[idx] = node_type
+            self.node_resource_types[idx] = resource_type
+            self.node_names[idx] = name
+            self.node_files[idx] = file
+            self.node_colors[idx] = color
+            self.node_shapes[idx] = shape
+            self.node_groups[idx] = group
+        return idx
+
+    @property
+    def nodes(self):
+        """Node ids; supports len(), iteration and membership tests."""
+        return self.id_to_idx.keys()
+
+    @property
+    def edges(self) -> List[Tuple[str, str]]:
+        """Edges as (source id, target id) pairs."""
+        ids = self.node_ids
+        return [(ids[src], ids[dst]) for src, dst in zip(self.edges_src, self.edges_dst)]
+
+    def csr(self) -> Tuple[array, array]:
+        """Outgoing adjacency in compressed sparse row form.
+
+        Returns ``(indptr, indices)``; the successors of node ``i`` are
+        ``indices[indptr[i]:indptr[i + 1]]``.
+        """
+        indptr = array('i', [0]) * (len(self.node_ids) + 1)
+        for src in self.edges_src:
+            indptr[src + 1] += 1
+        for i in range(1, len(indptr)):
+            indptr[i] += indptr[i - 1]
+
+        indices = array('i', [0]) * len(self.edges_src)
+        fill = indptr[:-1]
+        for src, dst in zip(self.edges_src, self.edges_dst):
+            indices[fill[src]] = dst
+            fill[src] += 1
+        return indptr, indices
+
+    def to_networkx(self):
+        """Build an equivalent networkx.DiGraph for callers that need the NetworkX API."""
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for node_id, node_type, resource_type, name, file, color, shape, group in zip(
+                self.node_ids, self.node_types, self.node_resource_types, self.node_names,
+                self.node_files, self.node_colors, self.node_shapes, self.node_groups):
+            attrs = {'type': node_type, 'name': name, 'file': file,
+                     'color': color, 'shape': shape, 'group': group}
+            if resource_type:
+                attrs['resource_type'] = resource_type
+            graph.add_node(node_id, **attrs)
+        graph.add_edges_from(self.edges)
+        return graph
+
 
 class BlastRadius:
     """Main class for generating Terraform dependency graphs."""
@@ -32,128 +586,241 @@ class BlastRadius:
     def __init__(self, terraform_dir: str):
         """Initialize BlastRadius with Terraform directory."""
         self.terraform_dir = Path(terraform_dir)
-        self.graph = nx.DiGraph()
+        self.graph = GraphStore()
         self.resources = {}
         self.data_sources = {}
         self.variables = {}
         self.outputs = {}
         self.modules = {}
+
+        # Serialized views of the graph, reused while its fingerprint is unchanged
+        self._graph_fingerprint = None
+        self._rendered_fingerprint = None
+        self._rendered = {}
         
     def parse_terraform(self) -> None:
         """Parse all Terraform files in the directory."""
         if not self.terraform_dir.exists():
             raise FileNotFoundError(f"Terraform directory not found: {self.terraform_dir}")
             
-        # Find all .tf files
-        tf_files = list(self.terraform_dir.glob("*.tf"))
+        # Find all .tf files, including those of nested modules
+        tf_files = sorted(_iter_tf_files(str(self.terraform_dir)))
         if not tf_files:
             raise ValueError(f"No .tf files found in {self.terraform_dir}")
             
-        for tf_file in tf_files:
+        # Serve unchanged files from the cache and only parse the misses
+        results = {}
+        misses = []
+        for path in tf_files:
             try:
-                with open(tf_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Parse HCL2 content
-                parsed = hcl2.loads(content)
-                
-                # Extract different resource types
-                for block in parsed:
-                    if 'resource' in block:
-                        for resource_type, resources in block['resource'].items():
-                            for resource_name, resource_config in resources.items():
-                                full_name = f"{resource_type}.{resource_name}"
-                                self.resources[full_name] = {
-                                    'type': resource_type,
-                                    'name': resource_name,
-                                    'config': resource_config,
-                                    'file': str(tf_file)
-                                }
-                                
-                    elif 'data' in block:
-                        for data_type, data_sources in block['data'].items():
-                            for data_name, data_config in data_sources.items():
-                                full_name = f"data.{data_type}.{data_name}"
-                                self.data_sources[full_name] = {
-                                    'type': data_type,
-                                    'name': data_name,
-                                    'config': data_config,
-                                    'file': str(tf_file)
-                                }
-                                
-                    elif 'variable' in block:
-                        for var_name, var_config in block['variable'].items():
-                            self.variables[var_name] = {
-                                'config': var_config,
-                                'file': str(tf_file)
-                            }
-                            
-                    elif 'output' in block:
-                        for output_name, output_config in block['output'].items():
-                            self.outputs[output_name] = {
-                                'config': output_config,
-                                'file': str(tf_file)
-                            }
-                            
-                    elif 'module' in block:
-                        for module_name, module_config in block['module'].items():
-                            self.modules[module_name] = {
-                                'config': module_config,
-                                'file': str(tf_file)
-                            }
-                            
-            except Exception as e:
-                print(f"Warning: Error parsing {tf_file}: {e}")
+                st = os.stat(path)
+                if st.st_size > MAX_FILE_BYTES:
+                    results[path] = (path, [], f"file is {st.st_size} bytes, "
+                                               f"over the {MAX_FILE_BYTES} byte limit")
+                    continue
+                key = _fingerprint(path, st.st_mtime_ns, st.st_size)
+            except OSError as e:
+                results[path] = (path, [], str(e))
                 continue
-                
+
+            blocks = _load_cached_blocks(key)
+            if blocks is None:
+                misses.append((path, key))
+            else:
+                results[path] = (path, blocks, None)
+
+        if misses:
+            paths = [path for path, _ in misses]
+            if len(misses) < MIN_PARALLEL_FILES:
+                # Starting worker processes costs more than parsing a handful of files
+                self._collect_parsed(results, misses, map(_parse_one, paths))
+            else:
+                # About four chunks per worker keeps every worker busy while
+                # still batching files to cut down on pickling round trips
+                workers = os.cpu_count() or 1
+                chunksize = max(1, len(paths) // (workers * 4))
+                ctx = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                    self._collect_parsed(results, misses,
+                                         pool.map(_parse_one, paths, chunksize=chunksize))
+            _evict_cache()
+
+        for tf_file, parsed, error in (results[path] for path in tf_files):
+            if error is not None:
+                logger.warning("Error parsing %s: %s", tf_file, error)
+                continue
+
+            # Blocks are single-key {kind: body} dicts; dispatch on the kind
+            handlers = self._BLOCK_HANDLERS
+            scope = self._scope_prefix(tf_file)
+            for block in parsed:
+                (kind, body), = block.items()
+                handler = handlers.get(kind)
+                if handler is not None:
+                    handler(self, body, tf_file, scope)
+
+    @staticmethod
+    def _collect_parsed(results: Dict, misses: List[Tuple[str, str]], parsed_misses) -> None:
+        """Store freshly parsed files in results and in the parse cache."""
+        for (path, key), result in zip(misses, parsed_misses):
+            results[path] = result
+            if result[2] is None:
+                _store_cached_blocks(key, result[1])
+
+    def _scope_prefix(self, tf_file: str) -> str:
+        """Id prefix for blocks declared in tf_file.
+
+        Empty for files in the root directory, and the relative directory plus
+        a slash ('modules/app/') for nested module directories, whose blocks
+        would otherwise collide with same-named blocks of sibling modules.
+        """
+        directory = os.path.relpath(os.path.dirname(tf_file), self.terraform_dir)
+        if directory == '.':
+            return ''
+        return directory.replace(os.sep, '/') + '/'
+
+    @staticmethod
+    def _declare(table: Dict, node_id: str, info: Dict) -> None:
+        """Record a declaration, warning when it replaces one with the same id."""
+        previous = table.get(node_id)
+        if previous is not None:
+            logger.warning("%s is declared in both %s and %s; keeping the latter",
+                           node_id, previous['file'], info['file'])
+        table[node_id] = info
+
+    def _add_resources(self, body: Dict, tf_file: str, scope: str) -> None:
+        """Record the resources declared in a resource block."""
+        for resource_type, resources in body.items():
+            for resource_name, resource_config in resources.items():
+                full_name = sys.intern(f"{scope}{resource_type}.{resource_name}")
+                self._declare(self.resources, full_name, {
+                    'type': resource_type,
+                    'name': resource_name,
+                    'config': resource_config,
+                    'file': tf_file
+                })
+
+    def _add_data_sources(self, body: Dict, tf_file: str, scope: str) -> None:
+        """Record the data sources declared in a data block."""
+        for data_type, data_sources in body.items():
+            for data_name, data_config in data_sources.items():
+                full_name = sys.intern(f"{scope}data.{data_type}.{data_name}")
+                self._declare(self.data_sources, full_name, {
+                    'type': data_type,
+                    'name': data_name,
+                    'config': data_config,
+                    'file': tf_file
+                })
+
+    def _add_variables(self, body: Dict, tf_file: str, scope: str) -> None:
+        """Record the variables declared in a variable block."""
+        for var_name, var_config in body.items():
+            self._declare(self.variables, sys.intern(f"{scope}{var_name}"), {
+                'config': var_config,
+                'file': tf_file
+            })
+
+    def _add_outputs(self, body: Dict, tf_file: str, scope: str) -> None:
+        """Record the outputs declared in an output block."""
+        for output_name, output_config in body.items():
+            self._declare(self.outputs, sys.intern(f"{scope}{output_name}"), {
+                'config': output_config,
+                'file': tf_file
+            })
+
+    def _add_modules(self, body: Dict, tf_file: str, scope: str) -> None:
+        """Record the module calls declared in a module block."""
+        for module_name, module_config in body.items():
+            self._declare(self.modules, sys.intern(f"{scope}{module_name}"), {
+                'config': module_config,
+                'file': tf_file
+            })
+
+    # Top-level block kind -> handler; other kinds (terraform, provider,
+    # locals, ...) do not become graph nodes and are skipped
+    _BLOCK_HANDLERS = {
+        'resource': _add_resources,
+        'data': _add_data_sources,
+        'variable': _add_variables,
+        'output': _add_outputs,
+        'module': _add_modules,
+    }
+
     def _extract_dependencies(self, config: Dict) -> Set[str]:
         """Extract dependencies from a resource configuration."""
         dependencies = set()
-        
-        def extract_refs(obj):
-            if isinstance(obj, dict):
+
+        # Walk with an explicit stack so deeply nested configs cannot hit the
+        # recursion limit; exact type checks are used since hcl2 only produces
+        # plain dicts and lists. Only containers are pushed, so scalar leaves
+        # (the bulk of any config) are never popped and re-checked; strings
+        # are scanned in place when they hold an interpolation.
+        if type(config) is str:
+            if '${' in config:
+                dependencies.update(_scan_references(config))
+            return dependencies
+        if type(config) not in _CONTAINER_TYPES:
+            return dependencies
+        stack = deque([config])
+        push = stack.append
+        pop = stack.pop
+        add = dependencies.add
+        update = dependencies.update
+        while stack:
+            obj = pop()
+            if type(obj) is dict:
                 for key, value in obj.items():
-                    if key == 'ref' and isinstance(value, list):
+                    if key == 'ref' and type(value) is list:
                         for ref in value:
-                            if isinstance(ref, dict) and 'name' in ref:
-                                dependencies.add(ref['name'])
-                    else:
-                        extract_refs(value)
-            elif isinstance(obj, list):
+                            if type(ref) is dict:
+                                name = ref.get('name')
+                                if name is not None:
+                                    add(name)
+                    elif type(value) in _CONTAINER_TYPES:
+                        push(value)
+                    elif type(value) is str and '${' in value:
+                        update(_scan_references(value))
+            else:
                 for item in obj:
-                    extract_refs(item)
-                    
-        extract_refs(config)
+                    if type(item) in _CONTAINER_TYPES:
+                        push(item)
+                    elif type(item) is str and '${' in item:
+                        update(_scan_references(item))
+
         return dependencies
+
+    def generate_graph(self) -> GraphStore:
+        """Generate the dependency graph from parsed Terraform resources."""
+        self.graph = GraphStore()
         
-    def generate_graph(self) -> nx.DiGraph:
-        """Generate NetworkX graph from parsed Terraform resources."""
         # Add all resources as nodes
         for resource_name, resource_info in self.resources.items():
+            color, shape, group = _node_style(resource_info['type'])
             self.graph.add_node(resource_name, 
-                              type='resource',
+                              node_type='resource',
                               resource_type=resource_info['type'],
                               name=resource_info['name'],
                               file=resource_info['file'],
-                              color=self._get_node_color(resource_info['type']),
-                              shape=self._get_node_shape(resource_info['type']),
-                              group=self._get_node_group(resource_info['type']))
+                              color=color,
+                              shape=shape,
+                              group=group)
                               
         # Add data sources as nodes
         for data_name, data_info in self.data_sources.items():
+            color, shape, group = _node_style(data_info['type'])
             self.graph.add_node(data_name,
-                              type='data',
+                              node_type='data',
                               resource_type=data_info['type'],
                               name=data_info['name'],
                               file=data_info['file'],
-                              color=self._get_node_color(data_info['type']),
-                              shape=self._get_node_shape(data_info['type']),
-                              group=self._get_node_group(data_info['type']))
+                              color=color,
+                              shape=shape,
+                              group=group)
                               
         # Add variables as nodes
         for var_name, var_info in self.variables.items():
             self.graph.add_node(var_name,
-                              type='variable',
+                              node_type='variable',
                               name=var_name,
                               file=var_info['file'],
                               color='#FFD700',  # Gold
@@ -163,7 +830,7 @@ class BlastRadius:
         # Add outputs as nodes
         for output_name, output_info in self.outputs.items():
             self.graph.add_node(output_name,
-                              type='output',
+                              node_type='output',
                               name=output_name,
                               file=output_info['file'],
                               color='#32CD32',  # LimeGreen
@@ -173,115 +840,484 @@ class BlastRadius:
         # Add modules as nodes
         for module_name, module_info in self.modules.items():
             self.graph.add_node(module_name,
-                              type='module',
+                              node_type='module',
                               name=module_name,
                               file=module_info['file'],
                               color='#9370DB',  # MediumPurple
                               shape='box',
                               group='modules')
                               
+        # Map every name a reference can use onto its node index so resolving
+        # a dependency is a single dict lookup. References resolve within the
+        # directory they are written in, so there is one map per id prefix
+        node_index = self.graph.id_to_idx
+        ref_indexes: Dict[str, Dict[str, int]] = {}
+        for node_id, idx in node_index.items():
+            scope, _, local = node_id.rpartition('/')
+            ref_indexes.setdefault(scope, {})[sys.intern(local)] = idx
+        for names, kind in ((self.variables, 'var'), (self.modules, 'module')):
+            for name in names:
+                scope, _, local = name.rpartition('/')
+                ref_indexes[scope][sys.intern(f"{kind}.{local}")] = node_index[name]
+
         # Add edges based on dependencies
+        edges_src = self.graph.edges_src
+        edges_dst = self.graph.edges_dst
         for resource_name, resource_info in self.resources.items():
+            ref_index = ref_indexes[resource_name.rpartition('/')[0]]
             dependencies = self._extract_dependencies(resource_info['config'])
-            for dep in dependencies:
-                if dep in self.graph.nodes:
-                    self.graph.add_edge(dep, resource_name)
-                    
+            # Sorted so edge order, and with it the layout, does not depend on string hashing
+            sources = sorted({ref_index[dep] for dep in dependencies if dep in ref_index})
+            target = node_index[resource_name]
+            edges_src.extend(sources)
+            edges_dst.extend([target] * len(sources))
+        self._graph_fingerprint = None
+
         return self.graph
         
-    def _get_node_color(self, resource_type: str) -> str:
+    @staticmethod
+    def _get_node_color(resource_type: str) -> str:
         """Get color for resource type."""
-        color_map = {
-            # AWS Resources
-            'aws_vpc': '#FF6B6B',
-            'aws_subnet': '#4ECDC4',
-            'aws_internet_gateway': '#45B7D1',
-            'aws_nat_gateway': '#96CEB4',
-            'aws_route_table': '#FFEAA7',
-            'aws_security_group': '#DDA0DD',
-            'aws_instance': '#98D8C8',
-            'aws_lb': '#F7DC6F',
-            'aws_rds_cluster': '#BB8FCE',
-            'aws_iam_role': '#85C1E9',
-            'aws_s3_bucket': '#F8C471',
-            'aws_lambda_function': '#82E0AA',
-            'aws_eks_cluster': '#F1948A',
-            'aws_autoscaling_group': '#85C1E9',
-            'aws_cloudwatch_log_group': '#F7DC6F',
-            
-            # Azure Resources
-            'azurerm_virtual_network': '#FF6B6B',
-            'azurerm_subnet': '#4ECDC4',
-            'azurerm_network_interface': '#45B7D1',
-            'azurerm_virtual_machine': '#96CEB4',
-            'azurerm_app_service_plan': '#FFEAA7',
-            'azurerm_app_service': '#DDA0DD',
-            'azurerm_storage_account': '#98D8C8',
-            'azurerm_sql_database': '#F7DC6F',
-            'azurerm_kubernetes_cluster': '#BB8FCE',
+        return _node_style(resource_type)[0]
+
+    @staticmethod
+    def _get_node_shape(resource_type: str) -> str:
+        """Get shape for resource type."""
+        return _node_style(resource_type)[1]
+
+    @staticmethod
+    def _get_node_group(resource_type: str) -> str:
+        """Get group for resource type."""
+        return _node_style(resource_type)[2]
+
+    def _d3_graph_data(self) -> Dict:
+        """Convert the graph to the node/link format used by the D3.js pages."""
+        graph_data = {
+            'nodes': [],
+            'links': []
+        }
+        
+        graph = self.graph
+        for node, node_type, group, color in zip(graph.node_ids, graph.node_types,
+                                                 graph.node_groups, graph.node_colors):
+            graph_data['nodes'].append({
+                'id': node,
+                'type': node_type,
+                'group': group,
+                'color': color
+            })
             
-            # Google Cloud Resources
-            'google_compute_network': '#FF6B6B',
-            'google_compute_subnetwork': '#4ECDC4',
-            'google_compute_instance': '#96CEB4',
-            'google_storage_bucket': '#F8C471',
-            'google_container_cluster': '#BB8FCE',
+        for source, target in sorted(graph.edges):
+            graph_data['links'].append({
+                'source': source,
+                'target': target
+            })
             
-            # Default
-            'default': '#CCCCCC'
+        # Sort so the payload does not depend on file-walk order
+        graph_data['nodes'].sort(key=itemgetter('id'))
+        self._attach_layout(graph_data['nodes'])
+        return graph_data
+        
+    def _d3_graph_skeleton(self) -> Dict:
+        """Graph topology only: node ids and links, without per-node metadata."""
+        graph_data = {
+            'nodes': [{'id': node} for node in sorted(self.graph.node_ids)],
+            'links': [{'source': source, 'target': target}
+                      for source, target in sorted(self.graph.edges)]
         }
+        self._attach_layout(graph_data['nodes'])
+        return graph_data
         
-        return color_map.get(resource_type, color_map['default'])
+    def _d3_graph_bytes(self) -> bytes:
+        """Serialized _d3_graph_data() for the current graph, with stable key order."""
+        return self._cached_bytes('graph-data',
+                                  lambda: _json_bytes(self._d3_graph_data(), sort_keys=True))
         
-    def _get_node_shape(self, resource_type: str) -> str:
-        """Get shape for resource type."""
-        shape_map = {
-            # Network resources
-            'aws_vpc': 'box',
-            'aws_subnet': 'box',
-            'aws_internet_gateway': 'diamond',
-            'aws_nat_gateway': 'diamond',
-            'aws_route_table': 'box',
-            'aws_security_group': 'ellipse',
+    def _compute_layout(self) -> Dict[str, Tuple[float, float]]:
+        """Return precomputed node positions keyed by node id, computed once per graph.
+
+        Graphviz lays the graph out; graphs of SFDP_MIN_NODES or more use sfdp,
+        Graphviz's multilevel force-directed engine, instead of dot's layered
+        layout. Without the Graphviz executables, _force_layout is used when
+        numpy is installed; otherwise the result is empty.
+        """
+        layout_json = self._cached_bytes('layout',
+                                         lambda: _json_bytes(self._layout_positions()))
+        return {node: tuple(pos) for node, pos in json.loads(layout_json).items()}
+        
+    def _layout_positions(self) -> Dict[str, List[float]]:
+        """Compute the positions returned by _compute_layout."""
+        dot = self._build_digraph()
+        if len(self.graph.node_ids) >= SFDP_MIN_NODES:
+            dot.engine = 'sfdp'
+        try:
+            layout = json.loads(dot.pipe(format='json0'))
+        except (graphviz.ExecutableNotFound, graphviz.CalledProcessError):
+            return self._force_layout_positions()
             
-            # Compute resources
-            'aws_instance': 'box',
-            'aws_lb': 'diamond',
-            'aws_autoscaling_group': 'box',
-            'aws_lambda_function': 'ellipse',
-            'aws_eks_cluster': 'box',
+        # Graphviz's y axis points up; flip it for screen coordinates
+        top = float(layout['bb'].split(',')[3])
+        positions = {}
+        for obj in layout.get('objects', []):
+            if 'pos' in obj:
+                x, y = obj['pos'].split(',')
+                positions[obj['name']] = [float(x), top - float(y)]
+        return positions
+        
+    def _force_layout_positions(self) -> Dict[str, List[float]]:
+        """Fallback layout from _force_layout, for when Graphviz is unavailable."""
+        graph = self.graph
+        backend = _layout_backend()
+        if backend is None:
+            return {}
+        np, _, max_nodes = backend
+        if not 0 < len(graph.node_ids) <= max_nodes:
+            return {}
+        x, y = _force_layout(len(graph.node_ids),
+                             np.frombuffer(graph.edges_src, dtype=np.int32),
+                             np.frombuffer(graph.edges_dst, dtype=np.int32))
+        return {node: [nx, ny] for node, nx, ny in zip(graph.node_ids, x.tolist(), y.tolist())}
+        
+    def _attach_layout(self, nodes: List[Dict]) -> None:
+        """Add precomputed x/y coordinates to D3 node dicts, if a layout is available."""
+        positions = self._compute_layout()
+        if not positions or any(node['id'] not in positions for node in nodes):
+            return
+        for node in nodes:
+            node['x'], node['y'] = positions[node['id']]
             
-            # Storage and database
-            'aws_s3_bucket': 'cylinder',
-            'aws_rds_cluster': 'cylinder',
+    def _cached_bytes(self, kind: str, build: Callable[[], bytes]) -> bytes:
+        """Return build() for the current graph, computing it once per graph fingerprint.
+
+        The fingerprint covers every node attribute as well as the edges, since
+        the exports include names, files, colors and so on.
+        """
+        if self._graph_fingerprint is None:
+            graph = self.graph
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr(sorted(zip(
+                graph.node_ids, graph.node_types, graph.node_resource_types,
+                graph.node_names, graph.node_files, graph.node_colors,
+                graph.node_shapes, graph.node_groups))).encode('utf-8'))
+            digest.update(repr(sorted(graph.edges)).encode('utf-8'))
+            self._graph_fingerprint = digest.hexdigest()
             
-            # Default
-            'default': 'box'
-        }
+        if self._rendered_fingerprint != self._graph_fingerprint:
+            self._rendered_fingerprint = self._graph_fingerprint
+            self._rendered = {}
+            
+        if kind not in self._rendered:
+            self._rendered[kind] = build()
+        return self._rendered[kind]
         
-        return shape_map.get(resource_type, shape_map['default'])
+    def export_html(self, output_file: str) -> None:
+        """Export graph as interactive HTML."""
+        graph_data = self._d3_graph_bytes().decode('utf-8')
+        html_content = _HTML_TEMPLATE.render(graph_data=graph_data,
+                                             layout_worker=_LAYOUT_WORKER_SOURCE)
         
-    def _get_node_group(self, resource_type: str) -> str:
-        """Get group for resource type."""
-        if resource_type.startswith('aws_vpc') or resource_type.startswith('aws_subnet'):
-            return 'networking'
-        elif resource_type.startswith('aws_instance') or resource_type.startswith('aws_lb'):
-            return 'compute'
-        elif resource_type.startswith('aws_s3') or resource_type.startswith('aws_rds'):
-            return 'storage'
-        elif resource_type.startswith('aws_iam'):
-            return 'security'
-        elif resource_type.startswith('aws_lambda'):
-            return 'serverless'
-        elif resource_type.startswith('aws_eks'):
-            return 'kubernetes'
+        # Write to file
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+            
+    def _build_digraph(self) -> graphviz.Digraph:
+        """Build the Graphviz representation shared by the SVG and PNG exports."""
+        dot = graphviz.Digraph(comment='Terraform Dependency Graph')
+        dot.attr(rankdir='TB')
+        
+        # Emit the DOT statements directly; going through dot.node()/dot.edge()
+        # re-parses keyword attributes and re-quotes every id on each call
+        graph = self.graph
+        quoted = [_dot_quote(node) for node in graph.node_ids]
+        lines = []
+        for node, name, node_type, color, shape in zip(quoted, graph.node_names,
+                                                       graph.node_types, graph.node_colors,
+                                                       graph.node_shapes):
+            label = _dot_quote(f"{name}\n({node_type})")
+            lines.append(f'\t{node} [label={label} fillcolor={_dot_quote(color)} '
+                         f'shape={_dot_quote(shape)} style=filled]\n')
+        lines.extend([f'\t{quoted[src]} -> {quoted[dst]}\n'
+                      for src, dst in zip(graph.edges_src, graph.edges_dst)])
+        dot.body.extend(lines)
+            
+        return dot
+        
+    def _get_svg_bytes(self) -> bytes:
+        """Rendered SVG for the current graph."""
+        return self._cached_bytes('svg', lambda: self._build_digraph().pipe(format='svg'))
+        
+    def _get_png_bytes(self) -> bytes:
+        """Rendered PNG for the current graph.
+
+        Without the Graphviz executables the PNG is drawn with Pillow from the
+        _compute_layout positions instead, when Pillow is installed.
+        """
+        def build() -> bytes:
+            try:
+                return self._build_digraph().pipe(format='png')
+            except graphviz.ExecutableNotFound:
+                png = self._draw_png()
+                if png is None:
+                    raise
+                return png
+                
+        return self._cached_bytes('png', build)
+        
+    def _draw_png(self) -> Optional[bytes]:
+        """Rasterize the laid-out graph with Pillow; None if that is not possible."""
+        try:
+            from PIL import Image, ImageDraw
+        except ImportError:
+            return None
+        positions = self._compute_layout()
+        if not positions:
+            return None
+            
+        graph = self.graph
+        # The right margin leaves room for the label of the rightmost node
+        margin, label_room, radius = 40, 200, 8
+        xs = [x for x, _ in positions.values()]
+        ys = [y for _, y in positions.values()]
+        left, top = min(xs), min(ys)
+        scale = min(1.0, PNG_MAX_SIDE / max(max(xs) - left, max(ys) - top, 1.0))
+        points = [None] * len(graph.node_ids)
+        for idx, node in enumerate(graph.node_ids):
+            x, y = positions[node]
+            points[idx] = (margin + (x - left) * scale, margin + (y - top) * scale)
+            
+        width = int((max(xs) - left) * scale) + 2 * margin + label_room
+        height = int((max(ys) - top) * scale) + 2 * margin
+        img = Image.new('RGB', (width, height), (255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for src, dst in zip(graph.edges_src, graph.edges_dst):
+            draw.line((points[src], points[dst]), fill=(153, 153, 153), width=1)
+        for (x, y), name, color in zip(points, graph.node_names, graph.node_colors):
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius),
+                         fill=color, outline=(51, 51, 51))
+            draw.text((x + radius + 2, y - radius), name, fill=(0, 0, 0))
+            
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue()
+        
+    def _get_json_bytes(self) -> bytes:
+        """Serialized JSON export for the current graph."""
+        return self._cached_bytes('json',
+                                  lambda: _json_bytes(self._json_export_data(), indent=True))
+        
+    def export_svg(self, output_file: str) -> None:
+        """Export graph as SVG."""
+        Path(output_file).write_bytes(self._get_svg_bytes())
+        
+    def export_png(self, output_file: str) -> None:
+        """Export graph as PNG."""
+        Path(output_file).write_bytes(self._get_png_bytes())
+        
+    def export_json(self, output_file: str) -> None:
+        """Export graph as JSON."""
+        Path(output_file).write_bytes(self._get_json_bytes())
+        
+    def _json_export_data(self) -> Dict:
+        """Full node/edge listing plus parse metadata, as written by export_json."""
+        graph = self.graph
+        ids = graph.node_ids
+        return {
+            'nodes': [{'id': node, 'type': node_type, 'resource_type': resource_type,
+                       'name': name, 'group': group, 'color': color, 'shape': shape,
+                       'file': file}
+                      for node, node_type, resource_type, name, group, color, shape, file
+                      in zip(ids, graph.node_types, graph.node_resource_types,
+                             graph.node_names, graph.node_groups, graph.node_colors,
+                             graph.node_shapes, graph.node_files)],
+            'edges': [{'source': ids[src], 'target': ids[dst]}
+                      for src, dst in zip(graph.edges_src, graph.edges_dst)],
+            'metadata': {
+                'terraform_dir': str(self.terraform_dir),
+                'total_resources': len(self.resources),
+                'total_data_sources': len(self.data_sources),
+                'total_variables': len(self.variables),
+                'total_outputs': len(self.outputs),
+                'total_modules': len(self.modules)
+            }
+        }
+            
+    def serve(self, host: str = 'localhost', port: int = 5000) -> None:
+        """Serve interactive visualization via Flask web server."""
+        app = self._create_app()
+        if wsgi_serve is not None:
+            wsgi_serve(app, host=host, port=port, threads=8)
         else:
-            return 'other'
+            print("waitress is not installed; falling back to the single-threaded "
+                  "Flask development server")
+            app.run(host=host, port=port, debug=False)
+
+    def _create_app(self) -> Flask:
+        """Build the Flask app behind serve(), with its payloads prebuilt."""
+        app = Flask(__name__)
+        index_html = _SERVE_TEMPLATE.render(layout_worker=_LAYOUT_WORKER_SOURCE)
+
+        @app.route('/')
+        def index():
+            return index_html
             
-    def export_html(self, output_file: str) -> None:
-        """Export graph as interactive HTML."""
-        # Create D3.js visualization HTML
-        html_template = """
+        def graph_skeleton_bytes() -> bytes:
+            return self._cached_bytes('graph-skeleton',
+                                      lambda: _json_bytes(self._d3_graph_skeleton(),
+                                                          sort_keys=True))
+            
+        def gzipped(kind: str, build: Callable[[], bytes]) -> bytes:
+            return self._cached_bytes(f'{kind}.gz',
+                                      lambda: gzip.compress(build(), compresslevel=6, mtime=0))
+            
+        def json_response(kind: str, build: Callable[[], bytes]) -> Response:
+            """Cached JSON payload, gzipped once per graph for clients that accept it."""
+            headers = {'Vary': 'Accept-Encoding'}
+            if not request.accept_encodings['gzip']:
+                return Response(build(), mimetype='application/json', headers=headers)
+            headers['Content-Encoding'] = 'gzip'
+            return Response(gzipped(kind, build), mimetype='application/json', headers=headers)
+            
+        # Build the payloads up front so the first page load does not pay for them
+        gzipped('graph-data', self._d3_graph_bytes)
+        gzipped('graph-skeleton', graph_skeleton_bytes)
+
+        @app.route('/graph-data')
+        def graph_data():
+            return json_response('graph-data', self._d3_graph_bytes)
+            
+        @app.route('/graph-skeleton')
+        def graph_skeleton():
+            return json_response('graph-skeleton', graph_skeleton_bytes)
+            
+        @app.route('/node-meta')
+        def node_meta():
+            graph = self.graph
+            meta = {}
+            for node_id in request.args.get('ids', '').split(','):
+                idx = graph.id_to_idx.get(node_id)
+                if idx is not None:
+                    meta[node_id] = {
+                        'type': graph.node_types[idx],
+                        'group': graph.node_groups[idx],
+                        'color': graph.node_colors[idx],
+                        'shape': graph.node_shapes[idx],
+                        'file': graph.node_files[idx]
+                    }
+            return Response(_json_bytes(meta), mimetype='application/json')
+            
+        exporters = {
+            'svg': self._get_svg_bytes,
+            'png': self._get_png_bytes,
+            'json': self._get_json_bytes,
+        }
+            
+        @app.route('/export/<format>')
+        def export(format):
+            if format not in exporters:
+                return jsonify({'error': 'Unsupported format'}), 400
+            return Response(exporters[format](),
+                            mimetype=_EXPORT_MIMETYPES[format],
+                            headers={'Content-Disposition':
+                                     f'attachment; filename=terraform-graph.{format}'})
+
+        return app
+
+
+# Force-layout Web Worker shared by both pages; each page embeds it in a
+# non-executing <script> tag and starts it from a Blob URL
+_LAYOUT_WORKER_SOURCE = """
+        importScripts("https://d3js.org/d3.v7.min.js");
+        
+        // Runs the force simulation off the main thread. Positions go back as
+        // parallel x and y Float32Arrays whose buffers are transferred.
+        const TICKS_PER_MESSAGE = 5;
+        const WARMUP_TICKS = 300;
+        let simulation = null;
+        let nodes = [];
+        let running = false;
+        
+        function postPositions() {
+            const xs = new Float32Array(nodes.length);
+            const ys = new Float32Array(nodes.length);
+            for (let i = 0; i < nodes.length; i++) {
+                xs[i] = nodes[i].x;
+                ys[i] = nodes[i].y;
+            }
+            const settled = simulation.alpha() < simulation.alphaMin();
+            postMessage({xs: xs, ys: ys, settled: settled}, [xs.buffer, ys.buffer]);
+        }
+        
+        // Tick in batches and yield between them so new messages (drags) are seen
+        function run() {
+            simulation.tick(TICKS_PER_MESSAGE);
+            postPositions();
+            running = simulation.alpha() >= simulation.alphaMin();
+            if (running) setTimeout(run, 0);
+        }
+        
+        function start() {
+            if (!running) {
+                running = true;
+                setTimeout(run, 0);
+            }
+        }
+        
+        onmessage = function(event) {
+            const message = event.data;
+            if (message.type === "init") {
+                const hasLayout = message.xs !== undefined;
+                nodes = Array.from({length: message.count}, (_, i) =>
+                    hasLayout ? {x: message.xs[i], y: message.ys[i]} : {});
+                const links = [];
+                for (let i = 0; i < message.links.length; i += 2) {
+                    links.push({source: message.links[i], target: message.links[i + 1]});
+                }
+                
+                // Barnes-Hut with a coarse theta and a short cooldown
+                simulation = d3.forceSimulation(nodes)
+                    .force("link", d3.forceLink(links).distance(100))
+                    .force("charge", d3.forceManyBody().strength(-300).theta(0.9))
+                    .force("collision", d3.forceCollide().radius(30))
+                    .alphaDecay(0.05)
+                    .alphaMin(0.05)
+                    .stop();
+                    
+                if (hasLayout) {
+                    // Start settled on the precomputed layout; forces resume only on drag
+                    simulation.alpha(0);
+                    postPositions();
+                } else {
+                    simulation.force("center", d3.forceCenter(message.width / 2, message.height / 2));
+                    
+                    // Warm up before the first post: ticking straight through is
+                    // much faster than ticking between frames, and the page's first
+                    // frame is then the (near) settled layout
+                    for (let i = 0; i < WARMUP_TICKS && simulation.alpha() >= simulation.alphaMin(); i++) {
+                        simulation.tick();
+                    }
+                    postPositions();
+                    if (simulation.alpha() >= simulation.alphaMin()) start();
+                }
+            } else if (message.type === "drag") {
+                // Reheat gently: neighbours follow the dragged node, and alpha is
+                // back under alphaMin, which stops the ticking, soon after release
+                const d = nodes[message.index];
+                d.fx = message.x;
+                d.fy = message.y;
+                simulation.alphaTarget(0.1);
+                if (simulation.alpha() < simulation.alphaMin()) simulation.alpha(simulation.alphaMin());
+                start();
+            } else if (message.type === "dragend") {
+                const d = nodes[message.index];
+                d.fx = null;
+                d.fy = null;
+                simulation.alphaTarget(0);
+            }
+        };
+"""
+
+# Standalone page written by export_html; graph data is embedded inline
+_HTML_SOURCE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -347,17 +1383,6 @@ class BlastRadius:
             margin-right: 5px;
             border-radius: 3px;
         }
-        .node {
-            cursor: pointer;
-        }
-        .node:hover {
-            stroke: #333;
-            stroke-width: 2px;
-        }
-        .link {
-            stroke: #999;
-            stroke-opacity: 0.6;
-        }
         .tooltip {
             position: absolute;
             background: rgba(0,0,0,0.8);
@@ -394,6 +1419,9 @@ class BlastRadius:
         <div id="graph"></div>
     </div>
 
+    <script id="layout-worker" type="text/js-worker">
+{{ layout_worker | safe }}
+    </script>
     <script>
         // Graph data
         const graphData = {{ graph_data | safe }};
@@ -401,325 +1429,322 @@ class BlastRadius:
         // Setup
         const width = 1000;
         const height = 600;
-        const margin = {top: 20, right: 20, bottom: 20, left: 20};
+        const nodeRadius = 8;
         
-        const svg = d3.select("#graph")
-            .append("svg")
-            .attr("width", width)
-            .attr("height", height);
+        // Draw on a canvas: a few batched paths per frame instead of updating
+        // one SVG element per node and link on every tick
+        const canvas = d3.select("#graph")
+            .append("canvas")
+            .attr("width", width * devicePixelRatio)
+            .attr("height", height * devicePixelRatio)
+            .style("width", `${width}px`)
+            .style("height", `${height}px`);
             
-        const g = svg.append("g")
-            .attr("transform", `translate(${margin.left},${margin.top})`);
+        const context = canvas.node().getContext("2d");
+        let transform = d3.zoomIdentity;
+        let hovered = -1;
+        
+        // Nodes carry x/y when the server could precompute a Graphviz layout
+        const hasLayout = graphData.nodes.length > 0 &&
+            graphData.nodes.every(d => d.x !== undefined);
             
-        // Zoom behavior
-        const zoom = d3.zoom()
-            .scaleExtent([0.1, 4])
-            .on("zoom", (event) => {
-                g.attr("transform", event.transform);
-            });
+        // Per-node state lives in parallel typed arrays indexed by node
+        // position; graphData.nodes is only consulted for ids and tooltips
+        const nodeCount = graphData.nodes.length;
+        let xs = new Float32Array(nodeCount);
+        let ys = new Float32Array(nodeCount);
+        const matched = new Uint8Array(nodeCount).fill(1);
+        
+        // Links as (source, target) node index pairs
+        const nodeIndex = new Map(graphData.nodes.map((d, i) => [d.id, i]));
+        const linkIndices = new Int32Array(graphData.links.length * 2);
+        graphData.links.forEach((d, i) => {
+            linkIndices[2 * i] = nodeIndex.get(d.source);
+            linkIndices[2 * i + 1] = nodeIndex.get(d.target);
+        });
+        
+        // Node indices grouped by fill color, one canvas path per group
+        const colorGroups = Array.from(
+            d3.group(d3.range(nodeCount), i => graphData.nodes[i].color),
+            ([color, indices]) => [color, Int32Array.from(indices)]);
             
-        svg.call(zoom);
-        
-        // Force simulation
-        const simulation = d3.forceSimulation(graphData.nodes)
-            .force("link", d3.forceLink(graphData.links).id(d => d.id).distance(100))
-            .force("charge", d3.forceManyBody().strength(-300))
-            .force("center", d3.forceCenter(width / 2, height / 2))
-            .force("collision", d3.forceCollide().radius(30));
+        // One path per fill color for the nodes whose match flag equals want
+        function drawNodes(alpha, want) {
+            context.globalAlpha = alpha;
+            for (const [color, indices] of colorGroups) {
+                context.beginPath();
+                for (let k = 0; k < indices.length; k++) {
+                    const i = indices[k];
+                    if (matched[i] !== want) continue;
+                    context.moveTo(xs[i] + nodeRadius, ys[i]);
+                    context.arc(xs[i], ys[i], nodeRadius, 0, 2 * Math.PI);
+                }
+                context.fillStyle = color;
+                context.fill();
+            }
+            context.globalAlpha = 1;
+        }
+        
+        function draw() {
+            context.setTransform(devicePixelRatio, 0, 0, devicePixelRatio, 0, 0);
+            context.clearRect(0, 0, width, height);
+            if (!positionsReady) return;
+            context.translate(transform.x, transform.y);
+            context.scale(transform.k, transform.k);
             
-        // Links
-        const link = g.append("g")
-            .selectAll("line")
-            .data(graphData.links)
-            .enter().append("line")
-            .attr("class", "link")
-            .attr("stroke-width", 2);
+            // Links, as a single path
+            context.beginPath();
+            for (let k = 0; k < linkIndices.length; k += 2) {
+                const s = linkIndices[k], t = linkIndices[k + 1];
+                context.moveTo(xs[s], ys[s]);
+                context.lineTo(xs[t], ys[t]);
+            }
+            context.lineWidth = 2;
+            context.strokeStyle = "rgba(153, 153, 153, 0.6)";
+            context.stroke();
             
-        // Nodes
-        const node = g.append("g")
-            .selectAll("circle")
-            .data(graphData.nodes)
-            .enter().append("circle")
-            .attr("class", "node")
-            .attr("r", 8)
-            .attr("fill", d => d.color)
-            .call(d3.drag()
-                .on("start", dragstarted)
-                .on("drag", dragged)
-                .on("end", dragended));
-                
+            // Nodes; search misses are dimmed
+            drawNodes(0.3, 0);
+            drawNodes(1, 1);
+            
+            if (hovered >= 0) {
+                context.beginPath();
+                context.arc(xs[hovered], ys[hovered], nodeRadius, 0, 2 * Math.PI);
+                context.lineWidth = 2;
+                context.strokeStyle = "#333";
+                context.stroke();
+            }
+        }
+        
+        // Redraw at most once per frame, however often positions arrive
+        let drawPending = false;
+        function scheduleDraw() {
+            if (drawPending) return;
+            drawPending = true;
+            requestAnimationFrame(() => {
+                drawPending = false;
+                draw();
+            });
+        }
+        
+        // Force layout runs in a Web Worker so the page stays responsive
+        const layoutWorker = new Worker(URL.createObjectURL(new Blob(
+            [document.getElementById("layout-worker").textContent],
+            {type: "text/javascript"})));
+            
+        let positionsReady = hasLayout;
+        let quadtree = null;
+        let dragging = -1;
+        
+        // The worker transfers fresh x/y arrays; adopt them without copying
+        layoutWorker.onmessage = function(event) {
+            const dragX = dragging >= 0 ? xs[dragging] : 0;
+            const dragY = dragging >= 0 ? ys[dragging] : 0;
+            xs = event.data.xs;
+            ys = event.data.ys;
+            if (dragging >= 0) {
+                xs[dragging] = dragX;
+                ys[dragging] = dragY;
+            }
+            positionsReady = true;
+            quadtree = null;
+            scheduleDraw();
+        };
+        
+        // Links are sent as a copy since the page keeps drawing from its own
+        const init = {
+            type: "init",
+            count: nodeCount,
+            links: linkIndices.slice(),
+            width: width,
+            height: height
+        };
+        const transfer = [init.links.buffer];
+        if (hasLayout) {
+            graphData.nodes.forEach((d, i) => {
+                xs[i] = d.x;
+                ys[i] = d.y;
+            });
+            init.xs = xs.slice();
+            init.ys = ys.slice();
+            transfer.push(init.xs.buffer, init.ys.buffer);
+        }
+        layoutWorker.postMessage(init, transfer);
+        
+        // Node index under a pointer position given in canvas pixels, or -1
+        function nodeAt(point) {
+            if (!positionsReady) return -1;
+            if (!quadtree) quadtree = d3.quadtree(d3.range(nodeCount), i => xs[i], i => ys[i]);
+            const [x, y] = transform.invert(point);
+            const i = quadtree.find(x, y, nodeRadius);
+            return i === undefined ? -1 : i;
+        }
+        
         // Tooltip
         const tooltip = d3.select("body").append("div")
             .attr("class", "tooltip")
             .style("opacity", 0);
             
-        node.on("mouseover", function(event, d) {
-            tooltip.transition()
-                .duration(200)
-                .style("opacity", .9);
-            tooltip.html(`<strong>${d.id}</strong><br/>Type: ${d.type}<br/>Group: ${d.group}`)
-                .style("left", (event.pageX + 5) + "px")
-                .style("top", (event.pageY - 28) + "px");
-        })
-        .on("mouseout", function(d) {
+        canvas.on("mousemove", function(event) {
+            const i = nodeAt(d3.pointer(event));
+            if (i === hovered) return;
+            hovered = i;
+            canvas.style("cursor", i >= 0 ? "pointer" : null);
+            if (i >= 0) {
+                const d = graphData.nodes[i];
+                tooltip.transition()
+                    .duration(200)
+                    .style("opacity", .9);
+                tooltip.html(`<strong>${d.id}</strong><br/>Type: ${d.type}<br/>Group: ${d.group}`)
+                    .style("left", (event.pageX + 5) + "px")
+                    .style("top", (event.pageY - 28) + "px");
+            } else {
+                tooltip.transition()
+                    .duration(500)
+                    .style("opacity", 0);
+            }
+            draw();
+        });
+        
+        canvas.on("mouseleave", function() {
+            hovered = -1;
             tooltip.transition()
                 .duration(500)
                 .style("opacity", 0);
+            draw();
         });
         
-        // Update positions
-        simulation.on("tick", () => {
-            link
-                .attr("x1", d => d.source.x)
-                .attr("y1", d => d.source.y)
-                .attr("x2", d => d.target.x)
-                .attr("y2", d => d.target.y);
-                
-            node
-                .attr("cx", d => d.x)
-                .attr("cy", d => d.y);
-        });
+        // Drag functions; the subject is tracked in canvas pixels and mapped
+        // back through the zoom transform
+        function dragsubject(event) {
+            const i = nodeAt([event.x, event.y]);
+            return i >= 0 ? {index: i, x: transform.applyX(xs[i]), y: transform.applyY(ys[i])} : null;
+        }
+        
+        function dragstarted(event) {
+            const i = event.subject.index;
+            dragging = i;
+            layoutWorker.postMessage({type: "drag", index: i, x: xs[i], y: ys[i]});
+        }
         
-        // Drag functions
-        function dragstarted(event, d) {
-            if (!event.active) simulation.alphaTarget(0.3).restart();
-            d.fx = d.x;
-            d.fy = d.y;
+        function dragged(event) {
+            const i = event.subject.index;
+            [xs[i], ys[i]] = transform.invert([event.x, event.y]);
+            quadtree = null;
+            layoutWorker.postMessage({type: "drag", index: i, x: xs[i], y: ys[i]});
+            scheduleDraw();
         }
         
-        function dragged(event, d) {
-            d.fx = event.x;
-            d.fy = event.y;
+        function dragended(event) {
+            dragging = -1;
+            layoutWorker.postMessage({type: "dragend", index: event.subject.index});
         }
         
-        function dragended(event, d) {
-            if (!event.active) simulation.alphaTarget(0);
-            d.fx = null;
-            d.fy = null;
+        // Zoom behavior; drag is attached first so it wins on nodes and
+        // leaves panning to zoom everywhere else
+        const zoom = d3.zoom()
+            .scaleExtent([0.1, 4])
+            .on("zoom", (event) => {
+                transform = event.transform;
+                draw();
+            });
+            
+        canvas
+            .call(d3.drag()
+                .container(canvas.node())
+                .subject(dragsubject)
+                .on("start", dragstarted)
+                .on("drag", dragged)
+                .on("end", dragended))
+            .call(zoom);
+            
+        // Zoom to fit the precomputed layout
+        function initialTransform() {
+            if (!hasLayout) return d3.zoomIdentity;
+            const [x0, x1] = d3.extent(xs);
+            const [y0, y1] = d3.extent(ys);
+            const scale = Math.min(4, 0.9 * Math.min(width / ((x1 - x0) || 1),
+                                                     height / ((y1 - y0) || 1)));
+            return d3.zoomIdentity
+                .translate(width / 2, height / 2)
+                .scale(scale)
+                .translate(-(x0 + x1) / 2, -(y0 + y1) / 2);
         }
         
+        canvas.call(zoom.transform, initialTransform());
+        
         // Control functions
         function resetZoom() {
-            svg.transition().duration(750).call(
+            canvas.transition().duration(750).call(
                 zoom.transform,
-                d3.zoomIdentity
+                initialTransform()
             );
         }
         
         function searchNodes(query) {
             const searchTerm = query.toLowerCase();
-            node.style("opacity", d => 
-                d.id.toLowerCase().includes(searchTerm) ? 1 : 0.3
-            );
+            graphData.nodes.forEach((d, i) => {
+                matched[i] = d.id.toLowerCase().includes(searchTerm) ? 1 : 0;
+            });
+            draw();
         }
         
-        function exportSVG() {
-            const svgData = new XMLSerializer().serializeToString(svg.node());
-            const svgBlob = new Blob([svgData], {type: "image/svg+xml;charset=utf-8"});
-            const svgUrl = URL.createObjectURL(svgBlob);
+        function download(url, filename) {
             const downloadLink = document.createElement("a");
-            downloadLink.href = svgUrl;
-            downloadLink.download = "terraform-dependency-graph.svg";
+            downloadLink.href = url;
+            downloadLink.download = filename;
             document.body.appendChild(downloadLink);
             downloadLink.click();
             document.body.removeChild(downloadLink);
         }
         
-        function exportPNG() {
-            const canvas = document.createElement("canvas");
-            const ctx = canvas.getContext("2d");
-            const img = new Image();
+        function exportSVG() {
+            // The page renders to a canvas, so build the SVG document from the
+            // current positions
+            const svg = d3.create("svg")
+                .attr("xmlns", "http://www.w3.org/2000/svg")
+                .attr("width", width)
+                .attr("height", height);
+                
+            const g = svg.append("g")
+                .attr("transform", transform.toString());
+                
+            g.append("g")
+                .attr("stroke", "#999")
+                .attr("stroke-opacity", 0.6)
+                .attr("stroke-width", 2)
+                .selectAll("line")
+                .data(d3.range(0, linkIndices.length, 2))
+                .join("line")
+                .attr("x1", k => xs[linkIndices[k]])
+                .attr("y1", k => ys[linkIndices[k]])
+                .attr("x2", k => xs[linkIndices[k + 1]])
+                .attr("y2", k => ys[linkIndices[k + 1]]);
+                
+            g.append("g")
+                .selectAll("circle")
+                .data(graphData.nodes)
+                .join("circle")
+                .attr("r", nodeRadius)
+                .attr("cx", (d, i) => xs[i])
+                .attr("cy", (d, i) => ys[i])
+                .attr("fill", d => d.color);
+                
             const svgData = new XMLSerializer().serializeToString(svg.node());
             const svgBlob = new Blob([svgData], {type: "image/svg+xml;charset=utf-8"});
-            const url = URL.createObjectURL(svgBlob);
-            
-            img.onload = function() {
-                canvas.width = width;
-                canvas.height = height;
-                ctx.drawImage(img, 0, 0);
-                const pngUrl = canvas.toDataURL("image/png");
-                const downloadLink = document.createElement("a");
-                downloadLink.href = pngUrl;
-                downloadLink.download = "terraform-dependency-graph.png";
-                document.body.appendChild(downloadLink);
-                downloadLink.click();
-                document.body.removeChild(downloadLink);
-            };
-            img.src = url;
+            download(URL.createObjectURL(svgBlob), "terraform-dependency-graph.svg");
+        }
+        
+        function exportPNG() {
+            download(canvas.node().toDataURL("image/png"), "terraform-dependency-graph.png");
         }
     </script>
 </body>
 </html>
-        """
-        
-        # Convert graph to D3.js format
-        graph_data = {
-            'nodes': [],
-            'links': []
-        }
-        
-        for node, attrs in self.graph.nodes(data=True):
-            graph_data['nodes'].append({
-                'id': node,
-                'type': attrs.get('type', 'unknown'),
-                'group': attrs.get('group', 'other'),
-                'color': attrs.get('color', '#CCCCCC')
-            })
-            
-        for source, target in self.graph.edges():
-            graph_data['links'].append({
-                'source': source,
-                'target': target
-            })
-            
-        # Render template
-        template = Template(html_template)
-        html_content = template.render(graph_data=json.dumps(graph_data))
-        
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-            
-    def export_svg(self, output_file: str) -> None:
-        """Export graph as SVG."""
-        dot = graphviz.Digraph(comment='Terraform Dependency Graph')
-        dot.attr(rankdir='TB')
-        
-        # Add nodes
-        for node, attrs in self.graph.nodes(data=True):
-            dot.node(node, 
-                    label=f"{attrs.get('name', node)}\n({attrs.get('type', 'unknown')})",
-                    style='filled',
-                    fillcolor=attrs.get('color', '#CCCCCC'),
-                    shape=attrs.get('shape', 'box'))
-                    
-        # Add edges
-        for source, target in self.graph.edges():
-            dot.edge(source, target)
-            
-        # Render SVG
-        dot.render(output_file, format='svg', cleanup=True)
-        
-    def export_png(self, output_file: str) -> None:
-        """Export graph as PNG."""
-        dot = graphviz.Digraph(comment='Terraform Dependency Graph')
-        dot.attr(rankdir='TB')
-        
-        # Add nodes
-        for node, attrs in self.graph.nodes(data=True):
-            dot.node(node, 
-                    label=f"{attrs.get('name', node)}\n({attrs.get('type', 'unknown')})",
-                    style='filled',
-                    fillcolor=attrs.get('color', '#CCCCCC'),
-                    shape=attrs.get('shape', 'box'))
-                    
-        # Add edges
-        for source, target in self.graph.edges():
-            dot.edge(source, target)
-            
-        # Render PNG
-        dot.render(output_file, format='png', cleanup=True)
-        
-    def export_json(self, output_file: str) -> None:
-        """Export graph as JSON."""
-        graph_data = {
-            'nodes': [],
-            'edges': [],
-            'metadata': {
-                'terraform_dir': str(self.terraform_dir),
-                'total_resources': len(self.resources),
-                'total_data_sources': len(self.data_sources),
-                'total_variables': len(self.variables),
-                'total_outputs': len(self.outputs),
-                'total_modules': len(self.modules)
-            }
-        }
-        
-        for node, attrs in self.graph.nodes(data=True):
-            graph_data['nodes'].append({
-                'id': node,
-                'type': attrs.get('type', 'unknown'),
-                'resource_type': attrs.get('resource_type', ''),
-                'name': attrs.get('name', node),
-                'group': attrs.get('group', 'other'),
-                'color': attrs.get('color', '#CCCCCC'),
-                'shape': attrs.get('shape', 'box'),
-                'file': attrs.get('file', '')
-            })
-            
-        for source, target in self.graph.edges():
-            graph_data['edges'].append({
-                'source': source,
-                'target': target
-            })
-            
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(graph_data, f, indent=2)
-            
-    def serve(self, host: str = 'localhost', port: int = 5000) -> None:
-        """Serve interactive visualization via Flask web server."""
-        app = Flask(__name__)
-        
-        @app.route('/')
-        def index():
-            return render_template_string(self._get_html_template())
-            
-        @app.route('/graph-data')
-        def graph_data():
-            graph_data = {
-                'nodes': [],
-                'links': []
-            }
-            
-            for node, attrs in self.graph.nodes(data=True):
-                graph_data['nodes'].append({
-                    'id': node,
-                    'type': attrs.get('type', 'unknown'),
-                    'group': attrs.get('group', 'other'),
-                    'color': attrs.get('color', '#CCCCCC')
-                })
-                
-            for source, target in self.graph.edges():
-                graph_data['links'].append({
-                    'source': source,
-                    'target': target
-                })
-                
-            return jsonify(graph_data)
-            
-        @app.route('/export/<format>')
-        def export(format):
-            if format == 'svg':
-                with tempfile.NamedTemporaryFile(suffix='.svg', delete=False) as tmp:
-                    self.export_svg(tmp.name)
-                    return send_from_directory(os.path.dirname(tmp.name), 
-                                            os.path.basename(tmp.name),
-                                            as_attachment=True,
-                                            download_name='terraform-graph.svg')
-            elif format == 'png':
-                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                    self.export_png(tmp.name)
-                    return send_from_directory(os.path.dirname(tmp.name), 
-                                            os.path.basename(tmp.name),
-                                            as_attachment=True,
-                                            download_name='terraform-graph.png')
-            elif format == 'json':
-                with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
-                    self.export_json(tmp.name)
-                    return send_from_directory(os.path.dirname(tmp.name), 
-                                            os.path.basename(tmp.name),
-                                            as_attachment=True,
-                                            download_name='terraform-graph.json')
-            else:
-                return jsonify({'error': 'Unsupported format'}), 400
-                
-        print(f"Starting web server at http://{host}:{port}")
-        print("Press Ctrl+C to stop the server")
-        app.run(host=host, port=port, debug=False)
-        
-    def _get_html_template(self) -> str:
-        """Get HTML template for web interface."""
-        return """
+"""
+
+# Page served by serve(); graph data is fetched from /graph-data
+_SERVE_SOURCE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -785,17 +1810,6 @@ class BlastRadius:
             margin-right: 5px;
             border-radius: 3px;
         }
-        .node {
-            cursor: pointer;
-        }
-        .node:hover {
-            stroke: #333;
-            stroke-width: 2px;
-        }
-        .link {
-            stroke: #999;
-            stroke-opacity: 0.6;
-        }
         .tooltip {
             position: absolute;
             background: rgba(0,0,0,0.8);
@@ -833,122 +1847,316 @@ class BlastRadius:
         <div id="graph"></div>
     </div>
 
+    <script id="layout-worker" type="text/js-worker">
+{{ layout_worker | safe }}
+    </script>
     <script>
         // Setup
         const width = 1000;
         const height = 600;
-        const margin = {top: 20, right: 20, bottom: 20, left: 20};
+        const nodeRadius = 8;
         
-        const svg = d3.select("#graph")
-            .append("svg")
-            .attr("width", width)
-            .attr("height", height);
+        // Draw on a canvas: a few batched paths per frame instead of updating
+        // one SVG element per node and link on every tick
+        const canvas = d3.select("#graph")
+            .append("canvas")
+            .attr("width", width * devicePixelRatio)
+            .attr("height", height * devicePixelRatio)
+            .style("width", `${width}px`)
+            .style("height", `${height}px`);
             
-        const g = svg.append("g")
-            .attr("transform", `translate(${margin.left},${margin.top})`);
+        const context = canvas.node().getContext("2d");
+        let transform = d3.zoomIdentity;
+        let hovered = -1;
+        
+        // Node metadata (type, group, color, ...) loaded on demand
+        const nodeMeta = new Map();
+        const requestedMeta = new Set();
+        const META_BATCH_SIZE = 200;
+        
+        // Load the graph topology first; metadata is fetched for visible nodes
+        d3.json("/graph-skeleton").then(function(graphData) {
+            // Nodes carry x/y when the server could precompute a Graphviz layout
+            const hasLayout = graphData.nodes.length > 0 &&
+                graphData.nodes.every(d => d.x !== undefined);
+                
+            // Per-node state lives in parallel typed arrays indexed by node
+            // position; graphData.nodes is only consulted for ids and tooltips
+            const nodeCount = graphData.nodes.length;
+            let xs = new Float32Array(nodeCount);
+            let ys = new Float32Array(nodeCount);
+            const matched = new Uint8Array(nodeCount).fill(1);
             
-        // Zoom behavior
-        const zoom = d3.zoom()
-            .scaleExtent([0.1, 4])
-            .on("zoom", (event) => {
-                g.attr("transform", event.transform);
+            // Links as (source, target) node index pairs
+            const nodeIndex = new Map(graphData.nodes.map((d, i) => [d.id, i]));
+            const linkIndices = new Int32Array(graphData.links.length * 2);
+            graphData.links.forEach((d, i) => {
+                linkIndices[2 * i] = nodeIndex.get(d.source);
+                linkIndices[2 * i + 1] = nodeIndex.get(d.target);
             });
             
-        svg.call(zoom);
-        
-        // Load graph data
-        d3.json("/graph-data").then(function(graphData) {
-            // Force simulation
-            const simulation = d3.forceSimulation(graphData.nodes)
-                .force("link", d3.forceLink(graphData.links).id(d => d.id).distance(100))
-                .force("charge", d3.forceManyBody().strength(-300))
-                .force("center", d3.forceCenter(width / 2, height / 2))
-                .force("collision", d3.forceCollide().radius(30));
+            // Nodes stay grey until their metadata arrives
+            function colorOf(i) {
+                const meta = nodeMeta.get(graphData.nodes[i].id);
+                return meta ? meta.color : "#CCCCCC";
+            }
+            
+            // Node indices grouped by fill color, one canvas path per group
+            function groupByColor() {
+                return Array.from(d3.group(d3.range(nodeCount), colorOf),
+                                  ([color, indices]) => [color, Int32Array.from(indices)]);
+            }
+            
+            let colorGroups = groupByColor();
                 
-            // Links
-            const link = g.append("g")
-                .selectAll("line")
-                .data(graphData.links)
-                .enter().append("line")
-                .attr("class", "link")
-                .attr("stroke-width", 2);
+            // One path per fill color for the nodes whose match flag equals want
+            function drawNodes(alpha, want) {
+                context.globalAlpha = alpha;
+                for (const [color, indices] of colorGroups) {
+                    context.beginPath();
+                    for (let k = 0; k < indices.length; k++) {
+                        const i = indices[k];
+                        if (matched[i] !== want) continue;
+                        context.moveTo(xs[i] + nodeRadius, ys[i]);
+                        context.arc(xs[i], ys[i], nodeRadius, 0, 2 * Math.PI);
+                    }
+                    context.fillStyle = color;
+                    context.fill();
+                }
+                context.globalAlpha = 1;
+            }
+            
+            function draw() {
+                context.setTransform(devicePixelRatio, 0, 0, devicePixelRatio, 0, 0);
+                context.clearRect(0, 0, width, height);
+                if (!positionsReady) return;
+                context.translate(transform.x, transform.y);
+                context.scale(transform.k, transform.k);
                 
-            // Nodes
-            const node = g.append("g")
-                .selectAll("circle")
-                .data(graphData.nodes)
-                .enter().append("circle")
-                .attr("class", "node")
-                .attr("r", 8)
-                .attr("fill", d => d.color)
-                .call(d3.drag()
-                    .on("start", dragstarted)
-                    .on("drag", dragged)
-                    .on("end", dragended));
-                    
+                // Links, as a single path
+                context.beginPath();
+                for (let k = 0; k < linkIndices.length; k += 2) {
+                    const s = linkIndices[k], t = linkIndices[k + 1];
+                    context.moveTo(xs[s], ys[s]);
+                    context.lineTo(xs[t], ys[t]);
+                }
+                context.lineWidth = 2;
+                context.strokeStyle = "rgba(153, 153, 153, 0.6)";
+                context.stroke();
+                
+                // Nodes; search misses are dimmed
+                drawNodes(0.3, 0);
+                drawNodes(1, 1);
+                
+                if (hovered >= 0) {
+                    context.beginPath();
+                    context.arc(xs[hovered], ys[hovered], nodeRadius, 0, 2 * Math.PI);
+                    context.lineWidth = 2;
+                    context.strokeStyle = "#333";
+                    context.stroke();
+                }
+            }
+            
+            // Redraw at most once per frame, however often positions arrive
+            let drawPending = false;
+            function scheduleDraw() {
+                if (drawPending) return;
+                drawPending = true;
+                requestAnimationFrame(() => {
+                    drawPending = false;
+                    draw();
+                });
+            }
+            
+            // Force layout runs in a Web Worker so the page stays responsive
+            const layoutWorker = new Worker(URL.createObjectURL(new Blob(
+                [document.getElementById("layout-worker").textContent],
+                {type: "text/javascript"})));
+                
+            let positionsReady = hasLayout;
+            let quadtree = null;
+            let dragging = -1;
+            
+            // The worker transfers fresh x/y arrays; adopt them without copying
+            layoutWorker.onmessage = function(event) {
+                const dragX = dragging >= 0 ? xs[dragging] : 0;
+                const dragY = dragging >= 0 ? ys[dragging] : 0;
+                xs = event.data.xs;
+                ys = event.data.ys;
+                if (dragging >= 0) {
+                    xs[dragging] = dragX;
+                    ys[dragging] = dragY;
+                }
+                positionsReady = true;
+                quadtree = null;
+                scheduleDraw();
+                if (event.data.settled) loadVisibleMeta();
+            };
+            
+            // Links are sent as a copy since the page keeps drawing from its own
+            const init = {
+                type: "init",
+                count: nodeCount,
+                links: linkIndices.slice(),
+                width: width,
+                height: height
+            };
+            const transfer = [init.links.buffer];
+            if (hasLayout) {
+                graphData.nodes.forEach((d, i) => {
+                    xs[i] = d.x;
+                    ys[i] = d.y;
+                });
+                init.xs = xs.slice();
+                init.ys = ys.slice();
+                transfer.push(init.xs.buffer, init.ys.buffer);
+            }
+            layoutWorker.postMessage(init, transfer);
+            
+            // Node index under a pointer position given in canvas pixels, or -1
+            function nodeAt(point) {
+                if (!positionsReady) return -1;
+                if (!quadtree) quadtree = d3.quadtree(d3.range(nodeCount), i => xs[i], i => ys[i]);
+                const [x, y] = transform.invert(point);
+                const i = quadtree.find(x, y, nodeRadius);
+                return i === undefined ? -1 : i;
+            }
+            
             // Tooltip
             const tooltip = d3.select("body").append("div")
                 .attr("class", "tooltip")
                 .style("opacity", 0);
                 
-            node.on("mouseover", function(event, d) {
-                tooltip.transition()
-                    .duration(200)
-                    .style("opacity", .9);
-                tooltip.html(`<strong>${d.id}</strong><br/>Type: ${d.type}<br/>Group: ${d.group}`)
-                    .style("left", (event.pageX + 5) + "px")
-                    .style("top", (event.pageY - 28) + "px");
-            })
-            .on("mouseout", function(d) {
+            canvas.on("mousemove", function(event) {
+                const i = nodeAt(d3.pointer(event));
+                if (i === hovered) return;
+                hovered = i;
+                canvas.style("cursor", i >= 0 ? "pointer" : null);
+                if (i >= 0) {
+                    const d = graphData.nodes[i];
+                    tooltip.transition()
+                        .duration(200)
+                        .style("opacity", .9);
+                    const meta = nodeMeta.get(d.id);
+                    tooltip.html(meta
+                            ? `<strong>${d.id}</strong><br/>Type: ${meta.type}<br/>Group: ${meta.group}`
+                            : `<strong>${d.id}</strong>`)
+                        .style("left", (event.pageX + 5) + "px")
+                        .style("top", (event.pageY - 28) + "px");
+                } else {
+                    tooltip.transition()
+                        .duration(500)
+                        .style("opacity", 0);
+                }
+                draw();
+            });
+            
+            canvas.on("mouseleave", function() {
+                hovered = -1;
                 tooltip.transition()
                     .duration(500)
                     .style("opacity", 0);
+                draw();
             });
             
-            // Update positions
-            simulation.on("tick", () => {
-                link
-                    .attr("x1", d => d.source.x)
-                    .attr("y1", d => d.source.y)
-                    .attr("x2", d => d.target.x)
-                    .attr("y2", d => d.target.y);
+            // Metadata loading
+            function loadVisibleMeta() {
+                const ids = graphData.nodes
+                    .filter((d, i) => {
+                        if (requestedMeta.has(d.id)) return false;
+                        const x = transform.applyX(xs[i]);
+                        const y = transform.applyY(ys[i]);
+                        return x >= 0 && x <= width && y >= 0 && y <= height;
+                    })
+                    .map(d => d.id);
                     
-                node
-                    .attr("cx", d => d.x)
-                    .attr("cy", d => d.y);
-            });
+                for (let i = 0; i < ids.length; i += META_BATCH_SIZE) {
+                    const batch = ids.slice(i, i + META_BATCH_SIZE);
+                    batch.forEach(id => requestedMeta.add(id));
+                    d3.json("/node-meta?ids=" + encodeURIComponent(batch.join(","))).then(meta => {
+                        Object.entries(meta).forEach(([id, m]) => nodeMeta.set(id, m));
+                        colorGroups = groupByColor();
+                        draw();
+                    });
+                }
+            }
             
-            // Drag functions
-            function dragstarted(event, d) {
-                if (!event.active) simulation.alphaTarget(0.3).restart();
-                d.fx = d.x;
-                d.fy = d.y;
+            setTimeout(loadVisibleMeta, 250);
+            
+            // Drag functions; the subject is tracked in canvas pixels and mapped
+            // back through the zoom transform
+            function dragsubject(event) {
+                const i = nodeAt([event.x, event.y]);
+                return i >= 0 ? {index: i, x: transform.applyX(xs[i]), y: transform.applyY(ys[i])} : null;
             }
             
-            function dragged(event, d) {
-                d.fx = event.x;
-                d.fy = event.y;
+            function dragstarted(event) {
+                const i = event.subject.index;
+                dragging = i;
+                layoutWorker.postMessage({type: "drag", index: i, x: xs[i], y: ys[i]});
             }
             
-            function dragended(event, d) {
-                if (!event.active) simulation.alphaTarget(0);
-                d.fx = null;
-                d.fy = null;
+            function dragged(event) {
+                const i = event.subject.index;
+                [xs[i], ys[i]] = transform.invert([event.x, event.y]);
+                quadtree = null;
+                layoutWorker.postMessage({type: "drag", index: i, x: xs[i], y: ys[i]});
+                scheduleDraw();
             }
             
+            function dragended(event) {
+                dragging = -1;
+                layoutWorker.postMessage({type: "dragend", index: event.subject.index});
+            }
+            
+            // Zoom behavior; drag is attached first so it wins on nodes and
+            // leaves panning to zoom everywhere else
+            const zoom = d3.zoom()
+                .scaleExtent([0.1, 4])
+                .on("zoom", (event) => {
+                    transform = event.transform;
+                    draw();
+                })
+                .on("end", loadVisibleMeta);
+                
+            canvas
+                .call(d3.drag()
+                    .container(canvas.node())
+                    .subject(dragsubject)
+                    .on("start", dragstarted)
+                    .on("drag", dragged)
+                    .on("end", dragended))
+                .call(zoom);
+                
+            // Zoom to fit the precomputed layout
+            function initialTransform() {
+                if (!hasLayout) return d3.zoomIdentity;
+                const [x0, x1] = d3.extent(xs);
+                const [y0, y1] = d3.extent(ys);
+                const scale = Math.min(4, 0.9 * Math.min(width / ((x1 - x0) || 1),
+                                                         height / ((y1 - y0) || 1)));
+                return d3.zoomIdentity
+                    .translate(width / 2, height / 2)
+                    .scale(scale)
+                    .translate(-(x0 + x1) / 2, -(y0 + y1) / 2);
+            }
+            
+            canvas.call(zoom.transform, initialTransform());
+            
             // Control functions
             window.resetZoom = function() {
-                svg.transition().duration(750).call(
+                canvas.transition().duration(750).call(
                     zoom.transform,
-                    d3.zoomIdentity
+                    initialTransform()
                 );
             }
             
             window.searchNodes = function(query) {
                 const searchTerm = query.toLowerCase();
-                node.style("opacity", d => 
-                    d.id.toLowerCase().includes(searchTerm) ? 1 : 0.3
-                );
+                graphData.nodes.forEach((d, i) => {
+                    matched[i] = d.id.toLowerCase().includes(searchTerm) ? 1 : 0;
+                });
+                draw();
             }
             
             window.exportSVG = function() {
@@ -966,7 +2174,11 @@ class BlastRadius:
     </script>
 </body>
 </html>
-        """
+"""
+
+# Compile once at import rather than on every export or request
+_HTML_TEMPLATE = Template(_HTML_SOURCE)
+_SERVE_TEMPLATE = Template(_SERVE_SOURCE)
 
 
 def main():
@@ -998,6 +2210,7 @@ Examples:
                        help='Output directory for exported files (default: output)')
     
     args = parser.parse_args()
+    logging.basicConfig(format='%(levelname)s: %(message)s')
     
     try:
         # Initialize BlastRadius
@@ -1017,10 +2230,8 @@ Examples:
         if args.export:
             os.makedirs(args.output, exist_ok=True)
         
-        # Handle different modes
-        if args.serve:
-            br.serve(host=args.host, port=args.port)
-        elif args.export:
+        # Handle different modes; serving is the default
+        if args.export and not args.serve:
             if args.format == 'all':
                 formats = ['html', 'svg', 'png', 'json']
             else:
@@ -1041,7 +2252,8 @@ Examples:
                     
             print(f"Export complete. Files saved to {args.output}/")
         else:
-            # Default: serve
+            print(f"Starting web server at http://{args.host}:{args.port}")
+            print("Press Ctrl+C to stop the server")
             br.serve(host=args.host, port=args.port)
             
     except Exception as e:
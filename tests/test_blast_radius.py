@@ -3,13 +3,26 @@
 Tests for Custom Blast Radius application
 """
 
+import gzip
+import math
+import re
 import pytest
 import tempfile
 import os
 from pathlib import Path
+import blast_radius
 from blast_radius import BlastRadius
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep each test's parse cache out of ~/.cache and away from other tests"""
+    path = tmp_path / "cache"
+    monkeypatch.setattr(blast_radius, "CACHE_DIR", path)
+    monkeypatch.setattr(blast_radius, "_blocks_memo", {})
+    return path
+
+
 class TestBlastRadius:
     """Test cases for BlastRadius class"""
 
@@ -80,6 +93,190 @@ output "vpc_id" {
             assert "region" in br.variables
             assert "vpc_id" in br.outputs
 
+    def test_parse_terraform_nested_modules(self):
+        """Test that nested module directories are parsed and hidden/vendored directories are skipped"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "modules" / "network").mkdir(parents=True)
+            (root / ".terraform" / "modules").mkdir(parents=True)
+            (root / ".terragrunt-cache" / "abc").mkdir(parents=True)
+            (root / "node_modules" / "pkg").mkdir(parents=True)
+            (root / "main.tf").write_text('''
+resource "aws_vpc" "main" {
+  cidr_block = "10.0.0.0/16"
+}
+''')
+            (root / "modules" / "network" / "main.tf").write_text('''
+resource "aws_subnet" "main" {
+  cidr_block = "10.0.1.0/24"
+}
+''')
+            (root / ".terraform" / "modules" / "main.tf").write_text('''
+resource "aws_instance" "cached" {
+  ami = "ami-12345678"
+}
+''')
+
+            (root / ".terragrunt-cache" / "abc" / "main.tf").write_text(
+                'resource "aws_instance" "terragrunt" {}\n')
+            (root / "node_modules" / "pkg" / "main.tf").write_text(
+                'resource "aws_instance" "vendored" {}\n')
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+
+            assert "aws_vpc.main" in br.resources
+            assert "modules/network/aws_subnet.main" in br.resources
+            assert "aws_instance.cached" not in br.resources
+            assert "aws_instance.terragrunt" not in br.resources
+            assert "aws_instance.vendored" not in br.resources
+
+    def test_nested_modules_have_their_own_namespace(self, caplog):
+        """Test that sibling modules may reuse names and references stay within their directory"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            for module in ("app", "db"):
+                (root / "modules" / module).mkdir(parents=True)
+                (root / "modules" / module / "main.tf").write_text('''
+variable "name" {}
+
+resource "aws_security_group" "this" {
+  name = var.name
+}
+''')
+            (root / "modules" / "app" / "instance.tf").write_text('''
+resource "aws_instance" "web" {
+  vpc_security_group_ids = [aws_security_group.this.id]
+}
+''')
+            (root / "main.tf").write_text('variable "name" {}\n')
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+            graph = br.generate_graph()
+
+            assert set(br.resources) == {
+                "modules/app/aws_security_group.this",
+                "modules/app/aws_instance.web",
+                "modules/db/aws_security_group.this",
+            }
+            assert br.variables["name"]["file"] == str(root / "main.tf")
+            assert set(graph.edges) == {
+                ("modules/app/name", "modules/app/aws_security_group.this"),
+                ("modules/db/name", "modules/db/aws_security_group.this"),
+                ("modules/app/aws_security_group.this", "modules/app/aws_instance.web"),
+            }
+            assert "declared in both" not in caplog.text
+
+    def test_duplicate_declarations_are_reported(self, caplog):
+        """Test that a declaration replacing one with the same id is logged"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "a.tf").write_text('resource "aws_vpc" "main" {}\n')
+            (Path(temp_dir) / "b.tf").write_text('resource "aws_vpc" "main" {}\n')
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+
+            assert "aws_vpc.main is declared in both" in caplog.text
+            assert br.resources["aws_vpc.main"]["file"].endswith("b.tf")
+
+    def test_parse_terraform_skips_oversized_files(self, monkeypatch):
+        """Test that files over the size limit are skipped"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "small.tf").write_text('variable "region" {}\n')
+            (Path(temp_dir) / "large.tf").write_text('variable "zone" {}\n' + "#" * 100 + "\n")
+            monkeypatch.setattr(blast_radius, "MAX_FILE_BYTES", 64)
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+
+            assert "region" in br.variables
+            assert "zone" not in br.variables
+
+    def test_parse_terraform_uses_cache(self, monkeypatch, cache_dir):
+        """Test that unchanged files are served from the parse cache"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tf_dir = Path(temp_dir)
+            (tf_dir / "main.tf").write_text('''
+resource "aws_vpc" "main" {
+  cidr_block = "10.0.0.0/16"
+}
+''')
+
+            BlastRadius(str(tf_dir)).parse_terraform()
+            assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+            # A warm run must not need to parse anything
+            blast_radius._blocks_memo.clear()
+
+            def fail(*args, **kwargs):
+                raise AssertionError("cache miss")
+
+            monkeypatch.setattr(blast_radius, "_parse_one", fail)
+            br = BlastRadius(str(tf_dir))
+            br.parse_terraform()
+            assert "aws_vpc.main" in br.resources
+
+    def test_cache_key_tracks_parser_version(self, monkeypatch):
+        """Test that cache keys change with the parser and cache format versions"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tf_file = Path(temp_dir) / "main.tf"
+            tf_file.write_text('variable "region" {}\n')
+            st = tf_file.stat()
+
+            def key():
+                blast_radius._fingerprint.cache_clear()
+                return blast_radius._fingerprint(str(tf_file), st.st_mtime_ns, st.st_size)
+
+            prefix = blast_radius._CACHE_KEY_PREFIX
+            before = key()
+            monkeypatch.setattr(blast_radius, "_CACHE_KEY_PREFIX", b"999:0.0.0:")
+            assert key() != before
+            monkeypatch.setattr(blast_radius, "_CACHE_KEY_PREFIX", prefix)
+            assert key() == before
+
+    def test_evict_cache_removes_stale_tmp_files(self, cache_dir):
+        """Test that temporary files left by a crashed writer are cleaned up"""
+        cache_dir.mkdir()
+        stale = cache_dir / "abc.123.tmp"
+        fresh = cache_dir / "def.456.tmp"
+        stale.write_bytes(b"x")
+        fresh.write_bytes(b"x")
+        os.utime(stale, (0, 0))
+
+        blast_radius._evict_cache()
+        assert not stale.exists()
+        assert fresh.exists()
+
+    def test_parse_terraform_small_tree_is_serial(self, monkeypatch):
+        """Test that a few files are parsed without starting a process pool"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def fail(*args, **kwargs):
+                raise AssertionError("process pool started")
+
+            monkeypatch.setattr(blast_radius, "ProcessPoolExecutor", fail)
+            (Path(temp_dir) / "main.tf").write_text('variable "region" {}\n')
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+            assert "region" in br.variables
+
+    def test_parse_terraform_process_pool(self, monkeypatch, caplog, cache_dir):
+        """Test that files parsed in worker processes are merged, reported and cached"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            monkeypatch.setattr(blast_radius, "MIN_PARALLEL_FILES", 1)
+            (Path(temp_dir) / "network.tf").write_text('resource "aws_vpc" "main" {}\n')
+            (Path(temp_dir) / "compute.tf").write_text('resource "aws_instance" "web" {}\n')
+            (Path(temp_dir) / "broken.tf").write_text('resource "aws_instance" {\n')
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+
+            assert set(br.resources) == {"aws_vpc.main", "aws_instance.web"}
+            assert "Error parsing" in caplog.text
+            assert "broken.tf" in caplog.text
+            assert len(list(cache_dir.glob("*.pkl"))) == 2
+
     def test_generate_graph(self):
         """Test graph generation"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -112,6 +309,224 @@ module "example" {
             assert "aws_subnet.main" in graph.nodes
             assert "example" in graph.nodes
 
+    def test_generate_graph_resolves_references(self):
+        """Test that references in expressions become edges"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tf_file = Path(temp_dir) / "main.tf"
+            tf_content = '''
+variable "project" {}
+
+data "aws_ami" "ubuntu" {
+  most_recent = true
+}
+
+resource "aws_vpc" "main" {
+  cidr_block = "10.0.0.0/16"
+  tags = {
+    Name = "${var.project}-vpc"
+  }
+}
+
+resource "aws_instance" "web" {
+  ami       = data.aws_ami.ubuntu.id
+  subnet_id = aws_vpc.main.id
+  count     = length(local.zones)
+}
+'''
+            tf_file.write_text(tf_content)
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+            graph = br.generate_graph()
+
+            assert set(graph.edges) == {
+                ("project", "aws_vpc.main"),
+                ("data.aws_ami.ubuntu", "aws_instance.web"),
+                ("aws_vpc.main", "aws_instance.web"),
+            }
+
+    def test_generate_graph_numeric_keys(self):
+        """Test that objects with numeric keys and very wide integers do not break the graph"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "main.tf").write_text('''
+variable "project" {}
+
+resource "aws_vpc" "main" {
+  cidr_block = "10.0.0.0/16"
+}
+
+resource "aws_subnet" "a" {
+  vpc_id = aws_vpc.main.id
+  tags = { 1 = "x", Name = "${var.project}-a" }
+}
+
+resource "aws_subnet" "b" {
+  vpc_id = aws_vpc.main.id
+  sizes  = [123456789012345678901234567890]
+}
+''')
+
+            br = BlastRadius(temp_dir)
+            br.parse_terraform()
+            graph = br.generate_graph()
+
+            assert set(graph.edges) == {
+                ("aws_vpc.main", "aws_subnet.a"),
+                ("project", "aws_subnet.a"),
+                ("aws_vpc.main", "aws_subnet.b"),
+            }
+
+    def test_reference_patterns_agree(self):
+        """Test that the RE2 reference pattern finds the same traversals as the re one"""
+        stdlib = re.compile(blast_radius._REFERENCE_PATTERN)
+        re2_style = re.compile(blast_radius._REFERENCE_PATTERN_RE2)
+        expressions = [
+            "${aws_vpc.main.id}",
+            "${var.project}-vpc",
+            "${data.aws_ami.ubuntu.id}",
+            "${module.vpc.private_subnets[0]}",
+            "${aws_subnet.a.id},${aws_subnet.b.id}",
+            "${concat(aws_subnet.a.*.id, [var.extra])}",
+            "${lookup(var.amis, var.region)}",
+            "${each.value.name}-${count.index}",
+            "${local.tags}",
+            "${aws_instance.web[0].private_ip}",
+            "${a.b.c.d.e}",
+            "${x-y.z_w}",
+            "${1.5 + aws_lb.front-end.arn}",
+            "${jsonencode({ name = aws_iam_role.r.name })}",
+            "10.0.0.0/16",
+            "ami.example.com",
+            "",
+        ]
+        for expression in expressions:
+            assert re2_style.findall(expression) == stdlib.findall(expression), expression
+
+    def test_graph_to_networkx(self):
+        """Test conversion of the graph store to NetworkX"""
+        br = BlastRadius("/tmp")
+        br.resources = {
+            "aws_vpc.main": {"type": "aws_vpc", "name": "main", "file": "main.tf", "config": {}},
+            "aws_subnet.main": {
+                "type": "aws_subnet", "name": "main", "file": "main.tf",
+                "config": {"vpc_id": {"ref": [{"name": "aws_vpc.main"}]}},
+            },
+        }
+        graph = br.generate_graph()
+        assert graph.edges == [("aws_vpc.main", "aws_subnet.main")]
+
+        nx_graph = graph.to_networkx()
+        assert set(nx_graph.nodes) == {"aws_vpc.main", "aws_subnet.main"}
+        assert list(nx_graph.edges) == [("aws_vpc.main", "aws_subnet.main")]
+        assert nx_graph.nodes["aws_vpc.main"]["group"] == "networking"
+
+    def test_graph_csr(self):
+        """Test the compressed sparse row adjacency of the graph store"""
+        graph = blast_radius.GraphStore()
+        for node_id in ("a", "b", "c"):
+            graph.add_node(node_id, node_type="resource", name=node_id, file="main.tf",
+                           color="#CCCCCC", shape="box", group="other")
+        graph.edges_src.extend([2, 0, 0])
+        graph.edges_dst.extend([1, 2, 1])
+
+        indptr, indices = graph.csr()
+        assert list(indptr) == [0, 2, 2, 3]
+        assert sorted(indices[indptr[0]:indptr[1]]) == [1, 2]
+        assert list(indices[indptr[2]:indptr[3]]) == [1]
+
+    def test_build_digraph_source(self):
+        """Test the DOT statements emitted for nodes and edges, including quoting"""
+        br = BlastRadius("/tmp")
+        br.resources = {
+            "aws_s3_bucket.logs": {
+                "type": "aws_s3_bucket", "name": 'say "hi"', "file": "main.tf",
+                "config": {"bucket": "${var.bucket}"},
+            },
+        }
+        br.variables = {"bucket": {"config": {}, "file": "variables.tf"}}
+        br.outputs = {"bucket_arn": {"config": {}, "file": "outputs.tf"}}
+        br.generate_graph()
+
+        assert br._build_digraph().source == (
+            '// Terraform Dependency Graph\n'
+            'digraph {\n'
+            '\trankdir=TB\n'
+            '\t"aws_s3_bucket.logs" [label="say \\"hi\\"\n(resource)" '
+            'fillcolor="#F8C471" shape="cylinder" style=filled]\n'
+            '\t"bucket" [label="bucket\n(variable)" '
+            'fillcolor="#FFD700" shape="ellipse" style=filled]\n'
+            '\t"bucket_arn" [label="bucket_arn\n(output)" '
+            'fillcolor="#32CD32" shape="ellipse" style=filled]\n'
+            '\t"bucket" -> "aws_s3_bucket.logs"\n'
+            '}\n'
+        )
+
+    def test_compute_layout_uses_sfdp_for_large_graphs(self, monkeypatch):
+        """Test that large graphs are laid out with sfdp and positions are flipped"""
+        engines = []
+
+        def fake_pipe(self, format):
+            engines.append(self.engine)
+            return b'{"bb": "0,0,100,50", "objects": [{"name": "a", "pos": "10,20"}]}'
+
+        monkeypatch.setattr(blast_radius.graphviz.Digraph, "pipe", fake_pipe)
+        br = BlastRadius("/tmp")
+        br.graph.add_node("a", node_type="resource", name="a", file="main.tf",
+                          color="#CCCCCC", shape="box", group="other")
+
+        assert br._compute_layout() == {"a": (10.0, 30.0)}
+        assert engines == ["dot"]
+
+        monkeypatch.setattr(blast_radius, "SFDP_MIN_NODES", 1)
+        br = BlastRadius("/tmp")
+        br.graph.add_node("a", node_type="resource", name="a", file="main.tf",
+                          color="#CCCCCC", shape="box", group="other")
+        br._compute_layout()
+        assert engines == ["dot", "sfdp"]
+
+    def test_compute_layout_falls_back_to_force_layout(self, monkeypatch):
+        """Test that nodes are still placed when Graphviz is not installed"""
+        pytest.importorskip("numpy")
+
+        def missing_pipe(self, format):
+            raise blast_radius.graphviz.ExecutableNotFound(("dot",))
+
+        monkeypatch.setattr(blast_radius.graphviz.Digraph, "pipe", missing_pipe)
+        layouts = []
+        for _ in range(2):
+            br = BlastRadius("/tmp")
+            for name in ("a", "b", "c"):
+                br.graph.add_node(name, node_type="resource", name=name, file="main.tf",
+                                  color="#CCCCCC", shape="box", group="other")
+            br.graph.edges_src.extend([0, 1])
+            br.graph.edges_dst.extend([1, 2])
+            layouts.append(br._compute_layout())
+
+        assert set(layouts[0]) == {"a", "b", "c"}
+        assert all(math.isfinite(v) for pos in layouts[0].values() for v in pos)
+        assert layouts[0] == layouts[1]
+
+    def test_export_png_without_graphviz(self, monkeypatch):
+        """Test that the PNG export is drawn with Pillow when Graphviz is not installed"""
+        pytest.importorskip("numpy")
+        pytest.importorskip("PIL")
+
+        def missing_pipe(self, format):
+            raise blast_radius.graphviz.ExecutableNotFound(("dot",))
+
+        monkeypatch.setattr(blast_radius.graphviz.Digraph, "pipe", missing_pipe)
+        br = BlastRadius("/tmp")
+        for name in ("a", "b"):
+            br.graph.add_node(name, node_type="resource", name=name, file="main.tf",
+                              color="#FF6B6B", shape="box", group="other")
+        br.graph.edges_src.append(0)
+        br.graph.edges_dst.append(1)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = Path(temp_dir) / "graph.png"
+            br.export_png(str(output_file))
+            assert output_file.read_bytes().startswith(b"\x89PNG")
+
     def test_export_json(self):
         """Test JSON export"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -136,6 +551,73 @@ resource "aws_vpc" "main" {
             assert output_file.exists()
             assert output_file.stat().st_size > 0
 
+    def test_export_json_tracks_attribute_changes(self):
+        """Test that regenerating a graph with the same topology refreshes the exports"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tf_dir = Path(temp_dir)
+            (tf_dir / "a.tf").write_text('resource "aws_vpc" "main" {}\n')
+
+            br = BlastRadius(str(tf_dir))
+            br.parse_terraform()
+            br.generate_graph()
+            assert b"a.tf" in br._get_json_bytes()
+
+            (tf_dir / "a.tf").rename(tf_dir / "b.tf")
+            br.resources = {}
+            br.parse_terraform()
+            br.generate_graph()
+            assert br.graph.node_files[0].endswith("b.tf")
+            assert b"b.tf" in br._get_json_bytes()
+            assert b"a.tf" not in br._get_json_bytes()
+
+    def _served_app(self):
+        """Flask test client for a two-node graph"""
+        br = BlastRadius("/tmp")
+        br.resources = {
+            "aws_vpc.main": {"type": "aws_vpc", "name": "main", "file": "main.tf", "config": {}},
+            "aws_subnet.main": {
+                "type": "aws_subnet", "name": "main", "file": "net.tf",
+                "config": {"vpc_id": "${aws_vpc.main.id}"},
+            },
+        }
+        br.generate_graph()
+        return br._create_app().test_client()
+
+    def test_serve_node_meta(self):
+        """Test that /node-meta returns metadata for known ids and skips unknown ones"""
+        client = self._served_app()
+
+        response = client.get("/node-meta?ids=aws_subnet.main,missing")
+        assert response.status_code == 200
+        assert response.get_json() == {
+            "aws_subnet.main": {"type": "resource", "group": "networking",
+                                "color": "#4ECDC4", "shape": "box", "file": "net.tf"},
+        }
+        assert client.get("/node-meta?ids=missing").get_json() == {}
+        assert client.get("/node-meta").get_json() == {}
+
+    def test_serve_graph_skeleton(self):
+        """Test that /graph-skeleton carries ids and links only"""
+        client = self._served_app()
+
+        payload = client.get("/graph-skeleton").get_json()
+        assert [node["id"] for node in payload["nodes"]] == ["aws_subnet.main", "aws_vpc.main"]
+        assert all(set(node) <= {"id", "x", "y"} for node in payload["nodes"])
+        assert payload["links"] == [{"source": "aws_vpc.main", "target": "aws_subnet.main"}]
+
+    def test_serve_gzips_when_accepted(self):
+        """Test that JSON payloads are gzipped only for clients that accept it"""
+        client = self._served_app()
+
+        for path in ("/graph-data", "/graph-skeleton"):
+            plain = client.get(path)
+            assert "Content-Encoding" not in plain.headers
+            assert plain.headers["Vary"] == "Accept-Encoding"
+
+            packed = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert packed.headers["Content-Encoding"] == "gzip"
+            assert gzip.decompress(packed.data) == plain.data
+
     def test_node_color_assignment(self):
         """Test node color assignment"""
         br = BlastRadius("/tmp")